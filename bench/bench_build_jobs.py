@@ -0,0 +1,68 @@
+"""Time a full build of a synthetic content directory with 1, 2, 4 and 8
+worker processes, with both `build` and the asyncio `build_async`, and
+check that every run produces identical output.
+
+Run from the repository root:
+
+    python3 bench/bench_build_jobs.py [page_count]
+"""
+import asyncio
+import hashlib
+import os
+import sys
+import tempfile
+import time
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), "..", "src"))
+
+from build import build, build_async
+
+
+PARAGRAPH = (
+    "Some **bold words**, a bit of *emphasis*, inline `code()` and a "
+    "[link](https://example.com/page) next to an ![image](/img/pic.png). "
+) * 6
+
+
+def make_content(content_dir, pages):
+    for i in range(pages):
+        section = os.path.join(content_dir, f"section{i % 20}")
+        os.makedirs(section, exist_ok=True)
+        with open(os.path.join(section, f"page{i}.md"), "w", encoding="utf-8") as f:
+            f.write("\n\n".join([PARAGRAPH] * 20))
+
+
+def tree_digest(output_dir):
+    digest = hashlib.sha256()
+    for root, dirs, files in os.walk(output_dir):
+        dirs.sort()
+        for name in sorted(files):
+            if name.endswith(".html"):
+                with open(os.path.join(root, name), "rb") as f:
+                    digest.update(name.encode("utf-8"))
+                    digest.update(f.read())
+    return digest.hexdigest()
+
+
+def main():
+    pages = int(sys.argv[1]) if len(sys.argv) > 1 else 2000
+    with tempfile.TemporaryDirectory() as tmp:
+        content_dir = os.path.join(tmp, "content")
+        make_content(content_dir, pages)
+        print(f"{'mode':<5} {'jobs':>4} {'seconds':>9} {'speedup':>8}  output")
+        baseline = None
+        for mode in ("sync", "async"):
+            for jobs in (1, 2, 4, 8):
+                output_dir = os.path.join(tmp, f"public-{mode}{jobs}")
+                start = time.perf_counter()
+                if mode == "async":
+                    asyncio.run(build_async(content_dir, output_dir, force=True, jobs=jobs))
+                else:
+                    build(content_dir, output_dir, force=True, jobs=jobs)
+                seconds = time.perf_counter() - start
+                baseline = baseline or seconds
+                print(f"{mode:<5} {jobs:>4} {seconds:>9.2f} {baseline / seconds:>7.2f}x  {tree_digest(output_dir)[:16]}")
+
+
+if __name__ == "__main__":
+    main()
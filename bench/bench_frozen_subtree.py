@@ -0,0 +1,71 @@
+"""Render many pages that share a site header and footer, with the shared
+subtrees rendered on every page and with them frozen once.
+
+Run from the repository root:
+
+    python3 bench/bench_frozen_subtree.py [pages]
+"""
+import os
+import sys
+import timeit
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), "..", "src"))
+
+from htmlnode import LeafNode, ParentNode
+
+
+def site_chrome(links):
+    nav = ParentNode("nav", [
+        ParentNode("ul", [
+            ParentNode("li", [LeafNode("a", f"Section {i}", {"href": f"/section/{i}/"})])
+            for i in range(links)
+        ]),
+    ], {"class": "site-nav"})
+    header = ParentNode("header", [LeafNode("h1", "Site"), nav])
+    footer = ParentNode("footer", [
+        LeafNode("p", "Copyright"),
+        ParentNode("ul", [LeafNode("li", f"Footer link {i}") for i in range(links // 2)]),
+    ])
+    return header, footer
+
+
+def make_pages(header, footer, count):
+    return [
+        ParentNode("body", [
+            header,
+            ParentNode("main", [LeafNode("p", f"Page {i} paragraph {j}") for j in range(5)]),
+            footer,
+        ])
+        for i in range(count)
+    ]
+
+
+def render_all(pages):
+    for page in pages:
+        page.to_html()
+
+
+def render_all_bytes(pages):
+    for page in pages:
+        page.to_html_bytes()
+
+
+def main():
+    count = int(sys.argv[1]) if len(sys.argv) > 1 else 2_000
+    print(f"{'links':>6} {'pages':>6} {'plain ms':>10} {'frozen ms':>10} {'speedup':>8} {'bytes ms':>9}")
+    for links in (10, 50, 200):
+        header, footer = site_chrome(links)
+        pages = make_pages(header, footer, count)
+        expected = [page.to_html() for page in pages]
+        plain = min(timeit.repeat(lambda: render_all(pages), number=1, repeat=3))
+        pages = make_pages(header.freeze(), footer.freeze(), count)
+        assert [page.to_html() for page in pages] == expected
+        frozen = min(timeit.repeat(lambda: render_all(pages), number=1, repeat=3))
+        # Frozen subtrees are spliced in pre-encoded by to_html_bytes.
+        frozen_bytes = min(timeit.repeat(lambda: render_all_bytes(pages), number=1, repeat=3))
+        print(f"{links:>6} {count:>6} {plain * 1e3:>10.1f} {frozen * 1e3:>10.1f} {plain / frozen:>7.1f}x "
+              f"{frozen_bytes * 1e3:>9.1f}")
+
+
+if __name__ == "__main__":
+    main()
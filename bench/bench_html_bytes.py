@@ -0,0 +1,75 @@
+"""Compare the str and UTF-8 bytes renderers: building the document in
+memory, and writing it to a file.
+
+Run from the repository root:
+
+    python3 bench/bench_html_bytes.py [size_in_chars]
+
+"in memory" is `to_html().encode()` against `to_html_bytes()`, with the
+tracemalloc peak of each. "to file" streams the tree into a text file
+with `write_html` and into a binary file with `write_html_bytes`.
+"""
+import os
+import sys
+import tempfile
+import timeit
+import tracemalloc
+
+BENCH_DIR = os.path.dirname(os.path.abspath(__file__))
+sys.path.insert(0, os.path.join(BENCH_DIR, "..", "src"))
+
+from corpus import make_paragraphs
+from htmlnode import ParentNode
+from markdown_to_text import text_to_textnodes
+from textnode import text_node_to_html_node
+
+
+def build_tree(paragraphs):
+    return ParentNode("div", [
+        ParentNode("p", [text_node_to_html_node(node) for node in text_to_textnodes(paragraph)])
+        for paragraph in paragraphs
+    ])
+
+
+def peak(func):
+    tracemalloc.start()
+    func()
+    result = tracemalloc.get_traced_memory()[1]
+    tracemalloc.stop()
+    return result
+
+
+def best(func):
+    return min(timeit.repeat(func, number=1, repeat=5))
+
+
+def main():
+    size = int(sys.argv[1]) if len(sys.argv) > 1 else 2_000_000
+    print(f"{'corpus':<8} {'renderer':<24} {'ms':>8} {'peak MB':>8}")
+    with tempfile.TemporaryDirectory() as tmp:
+        path = os.path.join(tmp, "page.html")
+
+        def write_text(tree):
+            with open(path, "w", encoding="utf-8") as f:
+                tree.write_html(f)
+
+        def write_bytes(tree):
+            with open(path, "wb") as f:
+                tree.write_html_bytes(f)
+
+        for kind in ("inline", "links", "nested"):
+            tree = build_tree(make_paragraphs(kind, size))
+            assert tree.to_html_bytes() == tree.to_html().encode()
+            rows = [
+                ("to_html().encode()", lambda: tree.to_html().encode(), True),
+                ("to_html_bytes()", tree.to_html_bytes, True),
+                ("write_html (text file)", lambda: write_text(tree), False),
+                ("write_html_bytes (file)", lambda: write_bytes(tree), False),
+            ]
+            for name, func, in_memory in rows:
+                memory = f"{peak(func) / 1e6:>8.1f}" if in_memory else f"{'':>8}"
+                print(f"{kind:<8} {name:<24} {best(func) * 1e3:>8.1f} {memory}")
+
+
+if __name__ == "__main__":
+    main()
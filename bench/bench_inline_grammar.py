@@ -0,0 +1,61 @@
+"""Per-call cost of the inline grammar: compiling the image/link patterns on
+every call versus the module-level patterns, and separate image and link
+passes versus the single combined sweep on link-dense text, a paragraph
+with one link, and plain prose.
+
+Run from the repository root:
+
+    python3 bench/bench_inline_grammar.py
+"""
+import os
+import re
+import sys
+import timeit
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), "..", "src"))
+
+from inline_grammar import IMAGE_REGEX, LINK_REGEX
+from markdown_to_text import extract_markdown_images, extract_markdown_links
+from markdown_to_text import split_nodes_image, split_nodes_link, split_nodes_image_link
+from textnode import TextNode, TextType
+
+
+TEXT = (
+    "Read the [guide](/guide) and look at ![diagram](/img/d.png), then see "
+    "[the API](/api) or ![logo](/img/logo.svg) for more. "
+) * 4
+PROSE = ("The quick brown fox jumps over the lazy dog, then keeps running through the field. " * 150)[:12_000]
+ONE_LINK = PROSE[:300] + "see [the docs](/docs) " + PROSE[:280]
+
+
+def compile_per_call_images(text):
+    return re.compile(IMAGE_REGEX).findall(text)
+
+
+def compile_per_call_links(text):
+    return re.compile(LINK_REGEX).findall(text)
+
+
+def report(label, func, number):
+    seconds = timeit.timeit(func, number=number)
+    print(f"{label:<36} {seconds / number * 1e6:>9.2f} us/call")
+    return seconds
+
+
+def main():
+    number = 20_000
+    print(f"text length {len(TEXT)}")
+    report("extract images, compile per call", lambda: compile_per_call_images(TEXT), number)
+    report("extract images, precompiled", lambda: extract_markdown_images(TEXT), number)
+    report("extract links, compile per call", lambda: compile_per_call_links(TEXT), number)
+    report("extract links, precompiled", lambda: extract_markdown_links(TEXT), number)
+    for label, text, calls in (("links", TEXT, number // 4), ("one link", ONE_LINK, number // 4), ("prose", PROSE, number // 50)):
+        nodes = [TextNode(text, TextType.plaintext)]
+        print(f"{label}: {len(text)} chars")
+        two = report("  split images then links", lambda: split_nodes_link(split_nodes_image(nodes)), calls)
+        one = report("  split images and links, one sweep", lambda: split_nodes_image_link(nodes), calls)
+        print(f"  one sweep speedup {two / one:.2f}x")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,86 @@
+"""Compare peak RSS when converting one large markdown file three ways:
+reading it whole (`read()` then markdown_to_html_node), streaming it line
+by line from a regular file, and streaming it from a memory map with
+convert_file(path, mmap=True).
+
+Each mode runs in a fresh subprocess that reports its own peak RSS. The
+mmap figure includes mapped file pages that were touched; those are backed
+by the page cache and can be dropped by the kernel, unlike heap memory.
+
+Run from the repository root:
+
+    python3 bench/bench_mmap_rss.py [megabytes]
+"""
+import os
+import resource
+import subprocess
+import sys
+import tempfile
+import time
+
+SRC_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), "..", "src")
+sys.path.insert(0, SRC_DIR)
+
+MODES = ("read", "stream", "mmap")
+
+SECTION = """## Release notes
+
+Fixed **several** bugs in the *parser* and the `renderer`, see [the issue](https://example.com/issues/1).
+
+- added ![icon](/img/icon.png) support
+- improved `to_html` speed
+
+"""
+
+
+def make_source(path, megabytes):
+    repeat = megabytes * (1 << 20) // len(SECTION) + 1
+    with open(path, "w", encoding="utf-8") as f:
+        for _ in range(repeat):
+            f.write(SECTION)
+
+
+def peak_rss_kb():
+    # ru_maxrss is in kilobytes on Linux and bytes on macOS.
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    return peak // 1024 if sys.platform == "darwin" else peak
+
+
+def convert(mode, path):
+    from block_markdown import convert_file, markdown_to_html_node
+
+    with open(os.devnull, "w", encoding="utf-8") as sink:
+        if mode == "read":
+            with open(path, encoding="utf-8") as f:
+                markdown_to_html_node(f.read()).write_html(sink)
+        else:
+            convert_file(path, mmap=(mode == "mmap"), fp=sink)
+
+
+def child(mode, path):
+    start = time.perf_counter()
+    convert(mode, path)
+    print(time.perf_counter() - start, peak_rss_kb())
+
+
+def main():
+    if len(sys.argv) > 1 and sys.argv[1] == "--child":
+        child(sys.argv[2], sys.argv[3])
+        return
+    megabytes = int(sys.argv[1]) if len(sys.argv) > 1 else 50
+    with tempfile.TemporaryDirectory() as tmp:
+        path = os.path.join(tmp, "big.md")
+        make_source(path, megabytes)
+        print(f"source {os.path.getsize(path) / 1e6:.1f} MB")
+        print(f"{'mode':<7} {'seconds':>8} {'peak RSS MB':>12}")
+        for mode in MODES:
+            out = subprocess.run(
+                [sys.executable, os.path.abspath(__file__), "--child", mode, path],
+                capture_output=True, text=True, check=True,
+            )
+            seconds, peak = out.stdout.split()
+            print(f"{mode:<7} {float(seconds):>8.2f} {int(peak) / 1024:>12.1f}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,56 @@
+"""Compare a TextNodeArray with lists of TextNodes and TextSpans: memory
+held per span, and the time to render the sequence with render_textnodes.
+
+Run from the repository root:
+
+    python3 bench/bench_node_array.py [size_in_chars]
+
+Memory is the tracemalloc growth while the parsed sequence is alive, not
+counting the source text itself.
+"""
+import os
+import sys
+import timeit
+import tracemalloc
+
+BENCH_DIR = os.path.dirname(os.path.abspath(__file__))
+sys.path.insert(0, os.path.join(BENCH_DIR, "..", "src"))
+
+from corpus import make_text
+from inline_scanner import tokenize_inline
+from markdown_to_text import text_to_textnode_array, text_to_textnodes
+from textnode import render_textnodes
+
+
+def measure(build):
+    tracemalloc.start()
+    before = tracemalloc.get_traced_memory()[0]
+    nodes = build()
+    after = tracemalloc.get_traced_memory()[0]
+    tracemalloc.stop()
+    return nodes, after - before
+
+
+def main():
+    size = int(sys.argv[1]) if len(sys.argv) > 1 else 4_000_000
+    rows = [
+        ("list[TextNode]", lambda text: text_to_textnodes(text)),
+        ("list[TextSpan]", lambda text: tokenize_inline(text, spans=True)),
+        ("TextNodeArray", lambda text: text_to_textnode_array(text)),
+    ]
+    print(f"{'corpus':<7} {'container':<15} {'spans':>8} {'bytes/span':>11} {'render ms':>10}")
+    for kind in ("inline", "links"):
+        text = make_text(kind, size)
+        expected = None
+        for name, build in rows:
+            nodes, size_bytes = measure(lambda: build(text))
+            html = render_textnodes(nodes)
+            expected = expected or html
+            assert html == expected, name
+            seconds = min(timeit.repeat(lambda: render_textnodes(nodes), number=1, repeat=3))
+            print(f"{kind:<7} {name:<15} {len(nodes):>8} {size_bytes / len(nodes):>11.1f} {seconds * 1e3:>10.1f}")
+            del nodes
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,92 @@
+"""Measure bytes per node for the slotted TextNode/HtmlNode classes against
+the previous dict-backed layout, using tracemalloc on a synthetic document.
+
+Run from the repository root:
+
+    python3 bench/bench_node_memory.py [node_count]
+"""
+import os
+import sys
+import tracemalloc
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), "..", "src"))
+
+from htmlnode import LeafNode, ParentNode
+from textnode import TextNode, TextType
+
+
+# The node classes as they were before __slots__, kept for comparison.
+class DictTextNode:
+    def __init__(self, text, text_type, url = None):
+        self.text = text
+        self.text_type = text_type
+        self.url = url
+
+
+class DictHtmlNode:
+    def __init__(self, tag = None, value = None, children = None, props = None):
+        self.tag = tag
+        self.value = value
+        self.children = children
+        self.props = props
+
+
+class DictLeafNode(DictHtmlNode):
+    def __init__(self, tag = None, value = None, props = None):
+        super().__init__(tag=tag, value=value, children=None, props=props)
+
+
+class DictParentNode(DictHtmlNode):
+    def __init__(self, tag = None, children = None, props = None):
+        super().__init__(tag=tag, value=None, children=children, props=props)
+
+
+# Span texts are shared so the measurement is dominated by the nodes.
+WORDS = ["plain words ", "bold", "italic", "code"]
+TYPES = [TextType.plaintext, TextType.bold, TextType.italic, TextType.codetext]
+TAGS = [None, "b", "i", "code"]
+SPANS_PER_PARAGRAPH = 9
+
+
+def build_text_nodes(count, text_node):
+    return [text_node(WORDS[i % 4], TYPES[i % 4], None) for i in range(count)]
+
+
+def build_html_document(count, leaf_node, parent_node):
+    # One paragraph ParentNode per SPANS_PER_PARAGRAPH leaves; count covers
+    # both leaves and paragraphs.
+    paragraphs = []
+    made = 0
+    while made < count:
+        leaves = [leaf_node(TAGS[i % 4], WORDS[i % 4]) for i in range(SPANS_PER_PARAGRAPH)]
+        paragraphs.append(parent_node("p", leaves))
+        made += SPANS_PER_PARAGRAPH + 1
+    return parent_node("div", paragraphs), made
+
+
+def measure(build):
+    tracemalloc.start()
+    before = tracemalloc.get_traced_memory()[0]
+    result = build()
+    after = tracemalloc.get_traced_memory()[0]
+    tracemalloc.stop()
+    return result, after - before
+
+
+def main():
+    count = int(sys.argv[1]) if len(sys.argv) > 1 else 1_000_000
+    rows = [
+        ("TextNode", "dict", lambda: (build_text_nodes(count, DictTextNode), count)),
+        ("TextNode", "slots", lambda: (build_text_nodes(count, TextNode), count)),
+        ("HtmlNode", "dict", lambda: build_html_document(count, DictLeafNode, DictParentNode)),
+        ("HtmlNode", "slots", lambda: build_html_document(count, LeafNode, ParentNode)),
+    ]
+    print(f"{'nodes':<9} {'layout':<6} {'count':>9} {'total MB':>10} {'bytes/node':>11}")
+    for name, layout, build in rows:
+        (document, made), size = measure(build)
+        print(f"{name:<9} {layout:<6} {made:>9} {size / 1e6:>10.1f} {size / made:>11.1f}")
+        del document
+
+
+if __name__ == "__main__":
+    main()
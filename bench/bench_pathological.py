@@ -0,0 +1,89 @@
+"""Stress the inline parsers with pathological delimiter input and check
+that the time they take grows linearly with the input size.
+
+Run from the repository root:
+
+    python3 bench/bench_pathological.py [--max-size 1048576] [--limit 10]
+
+Each input family (long runs of `*`, `**` and backticks, odd counts that
+end in an error, random delimiter soup) is parsed at the maximum size and
+at half and a quarter of it, in strict mode and in recovery mode. A
+family fails when doubling the size more than triples the time, or when
+any run exceeds `--limit` seconds. The exit status is 1 if anything
+failed.
+"""
+import argparse
+import os
+import random
+import sys
+import time
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), "..", "src"))
+
+from inline_scanner import tokenize_inline
+from markdown_to_text import text_to_textnodes
+
+
+def _soup(size, alphabet, seed=0):
+    rng = random.Random(seed)
+    return "".join(rng.choice(alphabet) for _ in range(size))
+
+
+FAMILIES = {
+    "stars": lambda size: "*" * size,
+    "stars_odd": lambda size: "*" * (size + 1),
+    "bold_then_star": lambda size: "**" * (size // 2) + "*",
+    "ticks_odd": lambda size: "`" * (size + 1),
+    "star_tick": lambda size: "*`" * (size // 2),
+    "open_brackets": lambda size: "![" * (size // 2),
+    "unclosed_links": lambda size: "[a](" * (size // 4),
+    "soup": lambda size: _soup(size, "**`[]()!a "),
+}
+
+ENGINES = {
+    "text_to_textnodes": text_to_textnodes,
+    "tokenize_inline": tokenize_inline,
+}
+
+
+def run_once(func, text, strict):
+    start = time.perf_counter()
+    try:
+        func(text, strict=strict)
+        outcome = "ok"
+    except Exception:
+        outcome = "error"
+    return time.perf_counter() - start, outcome
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Check inline parsing stays linear on pathological input")
+    parser.add_argument("--max-size", type=int, default=1 << 20, help="largest input, in characters")
+    parser.add_argument("--limit", type=float, default=10.0, help="seconds allowed for any single run")
+    args = parser.parse_args(argv)
+
+    sizes = [args.max_size // 4, args.max_size // 2, args.max_size]
+    failed = False
+    print(f"{'family':<15} {'engine':<18} {'mode':<8} {'outcome':<7} "
+          + " ".join(f"{size // 1024:>7}K" for size in sizes) + "   growth")
+    for family, make in FAMILIES.items():
+        texts = [make(size) for size in sizes]
+        for engine, func in ENGINES.items():
+            for strict in (True, False):
+                times = []
+                for text in texts:
+                    seconds, outcome = run_once(func, text, strict)
+                    times.append(seconds)
+                # Doubling the input should roughly double the time; allow
+                # slack for timer noise on the small runs.
+                growth = max(times[i + 1] / max(times[i], 1e-3) for i in range(len(times) - 1))
+                bad = growth > 3 or max(times) > args.limit
+                failed = failed or bad
+                print(f"{family:<15} {engine:<18} {'strict' if strict else 'recover':<8} {outcome:<7} "
+                      + " ".join(f"{seconds:>7.3f}s" for seconds in times)
+                      + f"   {growth:4.2f}x{'  FAIL' if bad else ''}")
+    return 1 if failed else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,65 @@
+"""Compare the explicit-stack ParentNode renderer against the old recursive
+one on deep chains and wide trees.
+
+Run from the repository root:
+
+    python3 bench/bench_render_depth.py
+"""
+import os
+import sys
+import timeit
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), "..", "src"))
+
+from htmlnode import LeafNode, ParentNode
+
+
+def recursive_to_html(node):
+    # The renderer as it was before the explicit stack, kept for comparison.
+    if isinstance(node, LeafNode):
+        return node.to_html()
+    props_str = node.props_to_html()
+    children_html = "".join(recursive_to_html(child) for child in node.children)
+    return f"<{node.tag}{props_str}>{children_html}</{node.tag}>"
+
+
+def deep_tree(depth):
+    node = LeafNode("b", "leaf")
+    for _ in range(depth):
+        node = ParentNode("div", [node])
+    return node
+
+
+def wide_tree(depth, width):
+    node = ParentNode("p", [LeafNode("b", "leaf") for _ in range(width)])
+    for _ in range(depth):
+        node = ParentNode("div", [node] + [LeafNode(None, "text") for _ in range(width)])
+    return node
+
+
+def measure(render, node, number):
+    try:
+        seconds = timeit.timeit(lambda: render(node), number=number)
+    except RecursionError:
+        return "RecursionError"
+    return f"{seconds / number * 1000:.3f} ms"
+
+
+def main():
+    cases = [
+        ("flat", 1, ParentNode("div", [LeafNode("b", f"leaf {i}") for i in range(1_000)]), 500),
+        ("deep", 10, deep_tree(10), 2000),
+        ("deep", 1_000, deep_tree(1_000), 50),
+        ("deep", 100_000, deep_tree(100_000), 3),
+        ("wide", 10, wide_tree(10, 100), 200),
+        ("wide", 1_000, wide_tree(1_000, 10), 10),
+    ]
+    print(f"{'shape':<6} {'depth':>7} {'recursive':>16} {'iterative':>16}")
+    for shape, depth, node, number in cases:
+        recursive = measure(recursive_to_html, node, number)
+        iterative = measure(lambda n: n.to_html(), node, number)
+        print(f"{shape:<6} {depth:>7} {recursive:>16} {iterative:>16}")
+
+
+if __name__ == "__main__":
+    main()
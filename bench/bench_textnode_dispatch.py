@@ -0,0 +1,73 @@
+"""Convert 1M mixed-type TextNodes to HTML three ways: the old if/elif
+chain, the dispatch table (text_node_to_html_node), and the string fast
+path (text_node_to_html) that skips the LeafNode.
+
+Run from the repository root:
+
+    python3 bench/bench_textnode_dispatch.py [node_count]
+"""
+import os
+import sys
+import time
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), "..", "src"))
+
+from htmlnode import LeafNode
+from textnode import TextNode, TextType, text_node_to_html, text_node_to_html_node
+
+
+def if_chain_to_html_node(text_node):
+    # The converter as it was before the dispatch table, kept for comparison.
+    if text_node.text_type == None:
+        raise Exception("TextNode must have a text_type")
+    else:
+        if text_node.text_type == TextType.plaintext:
+            return LeafNode(tag=None, value=text_node.text, props=None)
+        elif text_node.text_type == TextType.bold:
+            return LeafNode(tag="b", value=text_node.text, props=None)
+        elif text_node.text_type == TextType.italic:
+            return LeafNode(tag="i", value=text_node.text, props=None)
+        elif text_node.text_type == TextType.codetext:
+            return LeafNode(tag="code", value=text_node.text, props=None)
+        elif text_node.text_type == TextType.link:
+            return LeafNode(tag="a", value=text_node.text, props={"href": text_node.url} if text_node.url else None)
+        elif text_node.text_type == TextType.image:
+            return LeafNode(tag="img", value="", props={"src": text_node.url, "alt": text_node.text} if text_node.url else None)
+        else:
+            raise Exception(f"Unsupported TextType: {text_node.text_type}")
+
+
+def mixed_nodes(count):
+    templates = [
+        TextNode("some plain words ", TextType.plaintext),
+        TextNode("bold", TextType.bold),
+        TextNode("italic", TextType.italic),
+        TextNode("code()", TextType.codetext),
+        TextNode("a link", TextType.link, "https://example.com/page"),
+        TextNode("an image", TextType.image, "/img/pic.png"),
+    ]
+    return [templates[i % len(templates)] for i in range(count)]
+
+
+def timed(label, func, nodes):
+    start = time.perf_counter()
+    result = func(nodes)
+    seconds = time.perf_counter() - start
+    print(f"{label:<40} {seconds:>7.3f} s  {seconds / len(nodes) * 1e9:>7.0f} ns/node")
+    return result
+
+
+def main():
+    count = int(sys.argv[1]) if len(sys.argv) > 1 else 1_000_000
+    nodes = mixed_nodes(count)
+    print(f"{count} nodes")
+    timed("if/elif chain -> LeafNode", lambda ns: [if_chain_to_html_node(n) for n in ns], nodes)
+    timed("dispatch table -> LeafNode", lambda ns: [text_node_to_html_node(n) for n in ns], nodes)
+    old = timed("if/elif chain -> LeafNode -> to_html", lambda ns: [if_chain_to_html_node(n).to_html() for n in ns], nodes)
+    new = timed("dispatch table -> LeafNode -> to_html", lambda ns: [text_node_to_html_node(n).to_html() for n in ns], nodes)
+    fast = timed("text_node_to_html fragment", lambda ns: [text_node_to_html(n) for n in ns], nodes)
+    assert old == new == fast
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,73 @@
+"""Time how long a watch rebuild takes after a single save on a large
+synthetic site.
+
+Run from the repository root:
+
+    python3 bench/bench_watch.py [page_count]
+
+Reports the cost of one full poll with nothing changed (the scan alone),
+then the latency of picking up edits to one page, with a full poll and
+with the per-tick poll of pages edited in the session. The first edit
+converts the whole page, later edits reuse its unchanged blocks.
+"""
+import os
+import sys
+import tempfile
+import time
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), "..", "src"))
+
+from watch import Watcher
+
+
+PARAGRAPH = (
+    "Some **bold words**, a bit of *emphasis*, inline `code()` and a "
+    "[link](https://example.com/page) next to an ![image](/img/pic.png)."
+)
+
+
+def page_text(i, extra=""):
+    blocks = [f"# Page {i}"] + [PARAGRAPH] * 10 + ["- one\n- two\n- three"]
+    if extra:
+        blocks.append(extra)
+    return "\n\n".join(blocks)
+
+
+def write_page(path, text, tick):
+    with open(path, "w", encoding="utf-8") as f:
+        f.write(text)
+    os.utime(path, ns=(tick, tick))
+
+
+def main():
+    pages = int(sys.argv[1]) if len(sys.argv) > 1 else 20_000
+    with tempfile.TemporaryDirectory() as tmp:
+        content_dir = os.path.join(tmp, "content")
+        for i in range(pages):
+            section = os.path.join(content_dir, f"section{i % 100}")
+            os.makedirs(section, exist_ok=True)
+            with open(os.path.join(section, f"page{i}.md"), "w", encoding="utf-8") as f:
+                f.write(page_text(i))
+
+        watcher = Watcher(content_dir, os.path.join(tmp, "public"))
+        start = time.perf_counter()
+        watcher.start()
+        print(f"initial build of {pages} pages: {time.perf_counter() - start:.2f} s")
+
+        start = time.perf_counter()
+        watcher.poll()
+        print(f"idle poll: {(time.perf_counter() - start) * 1e3:.1f} ms")
+
+        path = os.path.join(content_dir, "section7", "page7.md")
+        for edit in range(1, 7):
+            write_page(path, page_text(7, f"Edit number {edit}."), time.time_ns() + edit)
+            full = edit <= 3
+            start = time.perf_counter()
+            report = watcher.poll() if full else watcher.poll(watcher.pages.keys())
+            seconds = time.perf_counter() - start
+            print(f"edit {edit} ({'full poll' if full else 'edited pages'}): {seconds * 1e3:6.1f} ms  "
+                  f"rendered {report['rendered']}, reused {report['reused']}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,83 @@
+"""Synthetic, deterministic markdown corpora for the benchmarks.
+
+Each corpus kind builds inline markdown of roughly `size` characters from a
+seeded generator, so the same kind and size give the same text on every
+run and on every machine.
+"""
+import random
+
+
+SIZES = {
+    "small": 1_000,
+    "medium": 32_000,
+    "large": 256_000,
+}
+
+WORDS = (
+    "static site generator markdown renders pages quickly from plain text "
+    "files into html with links images code and emphasis"
+).split()
+
+
+def _words(rng, count):
+    return " ".join(rng.choice(WORDS) for _ in range(count))
+
+
+def _prose_span(rng):
+    return _words(rng, rng.randint(6, 14)) + ". "
+
+
+def _inline_span(rng):
+    kind = rng.randrange(4)
+    if kind == 0:
+        return f"**{_words(rng, 2)}** "
+    if kind == 1:
+        return f"*{_words(rng, 2)}* "
+    if kind == 2:
+        return f"`{rng.choice(WORDS)}()` "
+    return _words(rng, 3) + " "
+
+
+def _link_span(rng):
+    word = rng.choice(WORDS)
+    if rng.randrange(3) == 0:
+        return f"![{word}](/img/{word}.png) "
+    return f"[{word}](https://example.com/{word}) "
+
+
+SPAN_MAKERS = {
+    "prose": _prose_span,
+    "inline": _inline_span,
+    "links": _link_span,
+    # Nested uses inline text; the nesting is applied to the HTML tree.
+    "nested": _inline_span,
+}
+
+KINDS = tuple(SPAN_MAKERS)
+
+
+def make_paragraphs(kind, size, seed=0, paragraph_size=400):
+    """Split a corpus into paragraph-sized pieces on span boundaries."""
+    rng = random.Random(f"{kind}-{size}-{seed}")
+    make_span = SPAN_MAKERS[kind]
+    paragraphs = []
+    current = []
+    length = 0
+    total = 0
+    while total < size:
+        span = make_span(rng)
+        current.append(span)
+        length += len(span)
+        total += len(span)
+        if length >= paragraph_size:
+            paragraphs.append("".join(current).strip())
+            current = []
+            length = 0
+    if current:
+        paragraphs.append("".join(current).strip())
+    return paragraphs
+
+
+def make_text(kind, size, seed=0):
+    """The whole corpus as one inline string."""
+    return " ".join(make_paragraphs(kind, size, seed))
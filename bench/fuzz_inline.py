@@ -0,0 +1,213 @@
+"""Differential fuzzer for the inline parsers.
+
+Generates random inline markdown from the supported grammar (plain words,
+code, bold, italic, links and images, plus stray delimiters and brackets)
+and checks every engine's `TextNode` output against the reference
+`text_to_textnodes`. The same run times each engine over the whole corpus,
+so correctness and throughput are compared together. Everything runs
+offline from a seeded generator; a failure prints the seed and a shrunk
+input that still reproduces it.
+
+Run from the repository root:
+
+    python3 bench/fuzz_inline.py                       # built-in engines
+    python3 bench/fuzz_inline.py --cases 50000 --seed 7 --json fuzz.json
+    python3 bench/fuzz_inline.py --engine mymodule:parse
+
+`--engine MODULE:FUNCTION` adds any callable taking the text and returning
+a list of nodes; it is held to the same results and error messages as the
+reference. The exit status is 1 if any engine disagreed.
+"""
+import argparse
+import importlib
+import json
+import os
+import random
+import sys
+import time
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), "..", "src"))
+
+from inline_scanner import tokenize_inline
+from markdown_to_text import iter_text_to_textnodes, text_to_textnode_array, text_to_textnodes
+
+
+WORDS = ("alpha", "beta", "x", "docs", "a b", "é", "🚀", "!", ".", "&", "<p>")
+URLS = ("https://example.com", "/docs", "img.png", "", "a b", "?q=1&r=2")
+# Stray syntax that makes inputs invalid or ambiguous.
+NOISE = ("*", "**", "`", "[", "]", "(", ")", "!", "![", "](", "***", "\n")
+
+
+def _text(rng):
+    return " ".join(rng.choice(WORDS) for _ in range(rng.randint(0, 3)))
+
+
+def _inline(rng, depth=0):
+    kind = rng.randrange(8)
+    if kind == 0:
+        return f"`{_text(rng)}`"
+    if kind == 1:
+        return f"**{_inner(rng, depth)}**"
+    if kind == 2:
+        return f"*{_inner(rng, depth)}*"
+    if kind == 3:
+        return f"[{_inner(rng, depth)}]({rng.choice(URLS)})"
+    if kind == 4:
+        return f"![{_text(rng)}]({rng.choice(URLS)})"
+    return _text(rng)
+
+
+def _inner(rng, depth):
+    # Nested markup is allowed in the grammar even where the parsers do not
+    # support it; the reference decides what it means.
+    if depth < 2 and rng.random() < 0.2:
+        return _inline(rng, depth + 1)
+    return _text(rng)
+
+
+def make_case(rng, noise=0.1):
+    parts = []
+    for _ in range(rng.randint(0, 8)):
+        if rng.random() < noise:
+            parts.append(rng.choice(NOISE))
+        else:
+            parts.append(_inline(rng))
+        parts.append(rng.choice(("", " ", " ", "\n")))
+    return "".join(parts)
+
+
+def make_corpus(cases, seed, noise):
+    rng = random.Random(seed)
+    return [make_case(rng, noise) for _ in range(cases)]
+
+
+class Engine:
+    def __init__(self, name, parse, same_errors=True, valid_only=False):
+        self.name = name
+        self.parse = parse
+        # Whether error messages must match the reference, or only the fact
+        # that an error is raised.
+        self.same_errors = same_errors
+        # Recovery modes: compared only on inputs the reference accepts,
+        # and must not raise on the others.
+        self.valid_only = valid_only
+
+
+BUILTIN_ENGINES = [
+    Engine("tokenize_inline", tokenize_inline),
+    Engine("tokenize_inline spans", lambda text: tokenize_inline(text, spans=True)),
+    Engine("tokenize_inline recover", lambda text: tokenize_inline(text, strict=False), valid_only=True),
+    Engine("text_to_textnode_array", lambda text: list(text_to_textnode_array(text))),
+    # Lazy stages can meet a later pass's error first.
+    Engine("iter_text_to_textnodes", lambda text: list(iter_text_to_textnodes(text)), same_errors=False),
+    Engine("iter_text_to_textnodes spans", lambda text: list(iter_text_to_textnodes(text, spans=True)), same_errors=False),
+]
+
+
+def load_engine(spec):
+    module_name, _, func_name = spec.partition(":")
+    if not func_name:
+        raise SystemExit(f"--engine expects MODULE:FUNCTION, got {spec!r}")
+    return Engine(spec, getattr(importlib.import_module(module_name), func_name))
+
+
+def outcome(parse, text):
+    try:
+        return "ok", parse(text)
+    except Exception as exc:
+        return "error", str(exc)
+
+
+def agrees(engine, expected, actual):
+    if expected[0] == "error":
+        if engine.valid_only:
+            return actual[0] == "ok"
+        return actual[0] == "error" and (not engine.same_errors or actual[1] == expected[1])
+    return actual == expected
+
+
+def shrink(text, still_fails):
+    """Remove chunks of `text` while `still_fails` holds, from large
+    chunks down to single characters."""
+    size = max(1, len(text) // 2)
+    while True:
+        i = 0
+        while i < len(text):
+            candidate = text[:i] + text[i + size:]
+            if still_fails(candidate):
+                text = candidate
+            else:
+                i += size
+        if size == 1:
+            return text
+        size //= 2
+
+
+def timed(parse, corpus):
+    start = time.perf_counter()
+    for text in corpus:
+        try:
+            parse(text)
+        except Exception:
+            pass
+    return time.perf_counter() - start
+
+
+def run(engines, corpus, repeat):
+    expected = [outcome(text_to_textnodes, text) for text in corpus]
+    chars = sum(len(text) for text in corpus)
+    report = {"cases": len(corpus), "chars": chars, "invalid": sum(e[0] == "error" for e in expected), "engines": []}
+
+    for engine in [Engine("text_to_textnodes", text_to_textnodes)] + engines:
+        mismatches = []
+        for text, want in zip(corpus, expected):
+            if not agrees(engine, want, outcome(engine.parse, text)):
+                mismatches.append(text)
+        seconds = min(timed(engine.parse, corpus) for _ in range(repeat))
+        entry = {
+            "engine": engine.name,
+            "mismatches": len(mismatches),
+            "seconds": seconds,
+            "cases_per_second": len(corpus) / seconds if seconds else None,
+            "chars_per_second": chars / seconds if seconds else None,
+        }
+        if mismatches:
+            def still_fails(text, engine=engine):
+                return not agrees(engine, outcome(text_to_textnodes, text), outcome(engine.parse, text))
+            entry["example"] = shrink(min(mismatches, key=len), still_fails)
+        report["engines"].append(entry)
+    return report
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Differential fuzzing of the inline parsers")
+    parser.add_argument("--cases", type=int, default=20_000)
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--noise", type=float, default=0.1, help="chance of a stray delimiter per part")
+    parser.add_argument("--repeat", type=int, default=3, help="timing rounds; the best is reported")
+    parser.add_argument("--engine", action="append", default=[], help="extra engine as MODULE:FUNCTION")
+    parser.add_argument("--only-extra", action="store_true", help="skip the built-in engines")
+    parser.add_argument("--json", help="also write the report as JSON here")
+    args = parser.parse_args(argv)
+
+    engines = [] if args.only_extra else list(BUILTIN_ENGINES)
+    engines += [load_engine(spec) for spec in args.engine]
+    corpus = make_corpus(args.cases, args.seed, args.noise)
+    report = run(engines, corpus, args.repeat)
+    report["seed"] = args.seed
+
+    print(f"{report['cases']} cases, {report['invalid']} invalid, {report['chars']} chars, seed {args.seed}")
+    print(f"{'engine':<30} {'mismatches':>10} {'cases/s':>10} {'MB/s':>7}")
+    for entry in report["engines"]:
+        print(f"{entry['engine']:<30} {entry['mismatches']:>10} {entry['cases_per_second']:>10.0f} "
+              f"{entry['chars_per_second'] / 1e6:>7.2f}")
+        if "example" in entry:
+            print(f"    shrunk failing input: {entry['example']!r}")
+    if args.json:
+        with open(args.json, "w", encoding="utf-8") as f:
+            json.dump(report, f, indent=1)
+    return 1 if any(entry["mismatches"] for entry in report["engines"]) else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,158 @@
+"""Time the markdown-to-HTML hot paths on the synthetic corpora and emit the
+results as JSON.
+
+Run from the repository root:
+
+    python3 bench/run.py                          # all kinds and sizes
+    python3 bench/run.py --sizes small medium --output before.json
+    python3 bench/run.py --compare before.json    # print ratios against a saved run
+
+Each stage is timed on its own, with its inputs prepared outside the timed
+region. The reported time is the best of `--repeat` rounds, divided by the
+number of calls per round.
+"""
+import argparse
+import datetime
+import json
+import os
+import platform
+import subprocess
+import sys
+import timeit
+
+BENCH_DIR = os.path.dirname(os.path.abspath(__file__))
+sys.path.insert(0, os.path.join(BENCH_DIR, "..", "src"))
+
+from corpus import KINDS, SIZES, make_paragraphs
+from htmlnode import ParentNode
+from markdown_to_text import split_nodes_delimiter, split_nodes_image, split_nodes_link, text_to_textnodes
+from textnode import TextNode, TextType, render_textnodes, text_node_to_html_node
+
+
+def build_tree(kind, paragraphs):
+    blocks = []
+    for paragraph in paragraphs:
+        leaves = [text_node_to_html_node(node) for node in text_to_textnodes(paragraph)]
+        blocks.append(ParentNode("p", leaves))
+    if kind != "nested":
+        return ParentNode("div", blocks)
+    # One list level per paragraph, like generated docs with deep outlines.
+    node = None
+    for block in reversed(blocks):
+        children = [block] if node is None else [block, node]
+        node = ParentNode("ul", [ParentNode("li", children)])
+    return ParentNode("div", [node])
+
+
+def stages(kind, paragraphs):
+    plain = [TextNode(paragraph, TextType.plaintext) for paragraph in paragraphs]
+    paragraph_nodes = [text_to_textnodes(paragraph) for paragraph in paragraphs]
+    textnodes = [node for nodes in paragraph_nodes for node in nodes]
+    tree = build_tree(kind, paragraphs)
+    return {
+        "split_nodes_delimiter": (lambda: split_nodes_delimiter(plain, "`", TextType.codetext), len(plain)),
+        "split_nodes_image": (lambda: split_nodes_image(plain), len(plain)),
+        "split_nodes_link": (lambda: split_nodes_link(plain), len(plain)),
+        "text_to_textnodes": (lambda: [text_to_textnodes(paragraph) for paragraph in paragraphs], len(paragraphs)),
+        "text_node_to_html_node": (lambda: [text_node_to_html_node(node) for node in textnodes], len(textnodes)),
+        "ParentNode.to_html": (tree.to_html, len(textnodes)),
+        "render_textnodes": (lambda: [render_textnodes(nodes) for nodes in paragraph_nodes], len(textnodes)),
+    }
+
+
+def time_stage(func, repeat, min_time):
+    # Pick a call count so a round takes at least `min_time` seconds.
+    number = 1
+    while True:
+        elapsed = timeit.timeit(func, number=number)
+        if elapsed >= min_time or number >= 1_000_000:
+            break
+        number *= 2 if elapsed == 0 else max(2, int(min_time / elapsed) + 1)
+    rounds = [elapsed] + timeit.repeat(func, number=number, repeat=repeat - 1)
+    return min(rounds) / number, number
+
+
+def git_commit():
+    try:
+        out = subprocess.run(
+            ["git", "rev-parse", "--short", "HEAD"],
+            cwd=BENCH_DIR, capture_output=True, text=True, check=True,
+        )
+    except (OSError, subprocess.CalledProcessError):
+        return None
+    return out.stdout.strip()
+
+
+def run(kinds, sizes, stage_names, repeat, min_time):
+    results = []
+    for size_name in sizes:
+        for kind in kinds:
+            paragraphs = make_paragraphs(kind, SIZES[size_name])
+            chars = sum(len(paragraph) for paragraph in paragraphs)
+            for stage, (func, items) in stages(kind, paragraphs).items():
+                if stage_names and stage not in stage_names:
+                    continue
+                seconds, number = time_stage(func, repeat, min_time)
+                results.append({
+                    "stage": stage,
+                    "corpus": kind,
+                    "size": size_name,
+                    "chars": chars,
+                    "items": items,
+                    "seconds": seconds,
+                    "number": number,
+                    "repeat": repeat,
+                })
+                print(f"{stage:<24} {kind:<7} {size_name:<7} {seconds * 1e3:>10.3f} ms", file=sys.stderr)
+    return {
+        "meta": {
+            "commit": git_commit(),
+            "python": platform.python_version(),
+            "implementation": platform.python_implementation(),
+            "machine": platform.machine(),
+            "timestamp": datetime.datetime.now(datetime.timezone.utc).isoformat(timespec="seconds"),
+        },
+        "results": results,
+    }
+
+
+def compare(report, baseline):
+    def key(result):
+        return (result["stage"], result["corpus"], result["size"])
+
+    old = {key(result): result["seconds"] for result in baseline["results"]}
+    print(f"{'stage':<24} {'corpus':<7} {'size':<7} {'before ms':>10} {'after ms':>10} {'ratio':>7}")
+    for result in report["results"]:
+        before = old.get(key(result))
+        if before is None:
+            continue
+        after = result["seconds"]
+        print(f"{result['stage']:<24} {result['corpus']:<7} {result['size']:<7} "
+              f"{before * 1e3:>10.3f} {after * 1e3:>10.3f} {after / before:>6.2f}x")
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Benchmark the markdown-to-HTML hot paths")
+    parser.add_argument("--kinds", nargs="+", choices=KINDS, default=list(KINDS))
+    parser.add_argument("--sizes", nargs="+", choices=list(SIZES), default=list(SIZES))
+    parser.add_argument("--stages", nargs="+", help="only run these stages")
+    parser.add_argument("--repeat", type=int, default=5)
+    parser.add_argument("--min-time", type=float, default=0.05, help="minimum seconds per timing round")
+    parser.add_argument("--output", help="write the JSON report here instead of stdout")
+    parser.add_argument("--compare", help="a previous JSON report to compare against")
+    args = parser.parse_args(argv)
+
+    report = run(args.kinds, args.sizes, args.stages, args.repeat, args.min_time)
+    if args.output:
+        with open(args.output, "w", encoding="utf-8") as f:
+            json.dump(report, f, indent=1)
+    elif not args.compare:
+        json.dump(report, sys.stdout, indent=1)
+        print()
+    if args.compare:
+        with open(args.compare, encoding="utf-8") as f:
+            compare(report, json.load(f))
+
+
+if __name__ == "__main__":
+    main()
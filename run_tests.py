@@ -0,0 +1,97 @@
+"""Run the unit tests in src/, optionally spread over worker processes.
+
+    python3 run_tests.py            # serial, same as `unittest discover -s src`
+    python3 run_tests.py -j 4       # four worker processes
+    python3 run_tests.py -j 0       # one worker per CPU
+
+Each test module runs as a whole in one worker, so module-level fixtures
+and state behave exactly as in a serial run. Modules start largest-first
+to keep the workers evenly loaded, and failures are printed once every
+module has finished. The exit status is 1 if any test failed.
+"""
+from concurrent.futures import ProcessPoolExecutor, as_completed
+import argparse
+import io
+import os
+import sys
+import time
+import unittest
+
+SRC_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), "src")
+
+
+def find_modules():
+    names = [name[:-3] for name in os.listdir(SRC_DIR) if name.startswith("test_") and name.endswith(".py")]
+    # Bigger files tend to hold more tests; start them first.
+    names.sort(key=lambda name: os.path.getsize(os.path.join(SRC_DIR, name + ".py")), reverse=True)
+    return names
+
+
+def run_module(name):
+    # Workers keep the parent's working directory, as the serial run does.
+    if SRC_DIR not in sys.path:
+        sys.path.insert(0, SRC_DIR)
+    suite = unittest.defaultTestLoader.loadTestsFromName(name)
+    stream = io.StringIO()
+    start = time.perf_counter()
+    result = unittest.TextTestRunner(stream=stream, verbosity=0).run(suite)
+    problems = [
+        (kind, str(test), trace)
+        for kind, entries in (("FAIL", result.failures), ("ERROR", result.errors))
+        for test, trace in entries
+    ]
+    return {
+        "module": name,
+        "tests": result.testsRun,
+        "skipped": len(result.skipped),
+        "problems": problems,
+        "seconds": time.perf_counter() - start,
+    }
+
+
+def run_parallel(jobs):
+    modules = find_modules()
+    start = time.perf_counter()
+    results = []
+    with ProcessPoolExecutor(max_workers=jobs) as executor:
+        futures = [executor.submit(run_module, name) for name in modules]
+        for future in as_completed(futures):
+            result = future.result()
+            results.append(result)
+            status = "FAILED" if result["problems"] else "ok"
+            print(f"{result['module']:<28} {result['tests']:>4} tests {result['seconds']:>7.2f}s  {status}")
+
+    problems = [problem for result in results for problem in result["problems"]]
+    for kind, test, trace in problems:
+        print("=" * 70)
+        print(f"{kind}: {test}")
+        print("-" * 70)
+        print(trace)
+
+    tests = sum(result["tests"] for result in results)
+    skipped = sum(result["skipped"] for result in results)
+    print("-" * 70)
+    print(f"Ran {tests} tests in {time.perf_counter() - start:.3f}s on {jobs} workers")
+    print()
+    if problems:
+        failures = sum(1 for kind, _, _ in problems if kind == "FAIL")
+        errors = len(problems) - failures
+        print(f"FAILED (failures={failures}, errors={errors})")
+        return 1
+    print(f"OK (skipped={skipped})" if skipped else "OK")
+    return 0
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Run the unit tests")
+    parser.add_argument("-j", "--jobs", type=int, default=1, help="worker processes (0: one per CPU)")
+    args = parser.parse_args(argv)
+
+    if args.jobs == 1:
+        program = unittest.main(module=None, argv=["run_tests", "discover", "-s", SRC_DIR], exit=False)
+        return 0 if program.result.wasSuccessful() else 1
+    return run_parallel(args.jobs or os.cpu_count() or 1)
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,212 @@
+"""Block-level markdown parsing over a stream of lines.
+
+`iter_blocks(lines)` reads any iterable of lines (an open file works) and
+yields one `(BlockType, lines)` pair per block as soon as the block ends,
+so only the block being read is held in memory. `iter_block_nodes` turns
+each block into a `ParentNode`, running its text through the inline
+`text_to_textnodes` pipeline.
+
+Supported blocks:
+- headings: `#` to `######` followed by a space, one line each
+- code: lines between two ``` fences, kept verbatim
+- quotes: consecutive lines starting with `>`
+- unordered lists: consecutive lines starting with `- ` or `* `
+- ordered lists: consecutive lines starting with `1. `, `2. `, ...
+- paragraphs: everything else
+
+Blocks end at a blank line or at a line of a different kind.
+
+Passing a `render_cache.RenderCache` as `cache` renders each piece of
+inline text through the cache instead, as a single raw LeafNode holding
+the cached HTML; the page output is the same.
+"""
+from enum import Enum
+from htmlnode import LeafNode, ParentNode
+from markdown_to_text import text_to_textnodes
+from textnode import text_node_to_html_node
+import io
+import mmap
+import os
+import re
+
+
+class BlockType(Enum):
+    paragraph = "paragraph"
+    heading = "heading"
+    code = "code"
+    quote = "quote"
+    unordered_list = "unordered_list"
+    ordered_list = "ordered_list"
+
+
+CODE_FENCE = "```"
+HEADING_PATTERN = re.compile(r"(#{1,6}) (.*)")
+ORDERED_ITEM_PATTERN = re.compile(r"\d+\. ")
+QUOTE_PATTERN = re.compile(r"> ?")
+
+
+def line_block_type(line):
+    """Return the BlockType a line starts or continues, or None for a blank
+    line. Code fences are reported as BlockType.code."""
+    if not line.strip():
+        return None
+    if line.startswith(CODE_FENCE):
+        return BlockType.code
+    if HEADING_PATTERN.match(line):
+        return BlockType.heading
+    if line.startswith(">"):
+        return BlockType.quote
+    if line.startswith("- ") or line.startswith("* "):
+        return BlockType.unordered_list
+    if ORDERED_ITEM_PATTERN.match(line):
+        return BlockType.ordered_list
+    return BlockType.paragraph
+
+
+def iter_blocks(lines):
+    block_type = None
+    block = []
+    in_code = False
+
+    for line in lines:
+        line = line.rstrip("\r\n")
+
+        if in_code:
+            if line.strip().startswith(CODE_FENCE):
+                yield BlockType.code, block
+                block = []
+                in_code = False
+            else:
+                block.append(line)
+            continue
+
+        kind = line_block_type(line)
+        if kind != block_type or kind in (BlockType.code, BlockType.heading):
+            if block:
+                yield block_type, block
+            block = []
+            block_type = kind
+
+        if kind is None:
+            continue
+        if kind == BlockType.code:
+            # The fence line (and any info string after it) is not content.
+            in_code = True
+            block_type = None
+            continue
+        block.append(line)
+        if kind == BlockType.heading:
+            yield BlockType.heading, block
+            block = []
+            block_type = None
+
+    if in_code:
+        raise Exception("Unclosed code block: missing closing ```")
+    if block:
+        yield block_type, block
+
+
+def text_to_children(text, cache=None):
+    if cache is not None:
+        return [LeafNode(None, cache.render(text))]
+    return [text_node_to_html_node(node) for node in text_to_textnodes(text)]
+
+
+def block_to_html_node(block_type, lines, cache=None):
+    if block_type == BlockType.paragraph:
+        return ParentNode("p", text_to_children("\n".join(lines), cache))
+    if block_type == BlockType.heading:
+        hashes, text = HEADING_PATTERN.match(lines[0]).groups()
+        return ParentNode(f"h{len(hashes)}", text_to_children(text, cache))
+    if block_type == BlockType.code:
+        code = "".join(line + "\n" for line in lines)
+        return ParentNode("pre", [LeafNode("code", code)])
+    if block_type == BlockType.quote:
+        text = "\n".join(QUOTE_PATTERN.sub("", line, count=1) for line in lines)
+        return ParentNode("blockquote", text_to_children(text, cache))
+    if block_type == BlockType.unordered_list:
+        items = [ParentNode("li", text_to_children(line[2:], cache)) for line in lines]
+        return ParentNode("ul", items)
+    if block_type == BlockType.ordered_list:
+        items = [ParentNode("li", text_to_children(ORDERED_ITEM_PATTERN.sub("", line, count=1), cache)) for line in lines]
+        return ParentNode("ol", items)
+    raise Exception(f"Unsupported BlockType: {block_type}")
+
+
+def iter_block_nodes(lines, cache=None):
+    for block_type, block in iter_blocks(lines):
+        yield block_to_html_node(block_type, block, cache)
+
+
+def markdown_to_html_node(markdown, cache=None):
+    # Split on "\n" only, like the file readers; str.splitlines() would
+    # also split on form feeds, U+2028 and other separators.
+    return ParentNode("div", list(iter_block_nodes(markdown.split("\n"), cache)))
+
+
+def write_markdown_html(lines, fp, cache=None):
+    """Stream the HTML for a markdown line stream into `fp`, one block at a
+    time."""
+    fp.write("<div>")
+    for node in iter_block_nodes(lines, cache):
+        node.write_html(fp)
+    fp.write("</div>")
+
+
+def write_markdown_html_bytes(lines, fp, cache=None):
+    """`write_markdown_html` for a binary `fp` (or a bytearray), writing
+    UTF-8 without a text wrapper encoding every chunk."""
+    write = fp.extend if isinstance(fp, bytearray) else fp.write
+    write(b"<div>")
+    for node in iter_block_nodes(lines, cache):
+        node.write_html_bytes(fp)
+    write(b"</div>")
+
+
+def iter_mapped_lines(path, encoding="utf-8"):
+    """Yield the lines of `path` from a read-only memory map, decoding one
+    line at a time instead of the whole file.
+
+    Line endings are translated like a file opened in text mode: "\r\n"
+    and a lone "\r" both end a line and are yielded as "\n".
+    """
+    with open(path, "rb") as f:
+        if os.fstat(f.fileno()).st_size == 0:
+            return
+        with mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as mapped:
+            for line in iter(mapped.readline, b""):
+                line = line.decode(encoding)
+                if "\r" not in line:
+                    yield line
+                    continue
+                # readline only splits on "\n", so a "\r\n" pair is never
+                # cut in two; any other "\r" ends a line of its own.
+                *lines, last = line.replace("\r\n", "\n").replace("\r", "\n").split("\n")
+                for part in lines:
+                    yield part + "\n"
+                if last:
+                    yield last
+
+
+def convert_file(path, mmap=True, fp=None, cache=None):
+    """Convert the markdown file at `path` to HTML.
+
+    With `mmap` the source is read through a memory map, otherwise through
+    a regular buffered file; both read one line at a time. The HTML is
+    streamed into `fp` when given, otherwise returned as a string.
+    """
+    if fp is None:
+        buffer = io.StringIO()
+        convert_file(path, mmap=mmap, fp=buffer, cache=cache)
+        return buffer.getvalue()
+    if mmap:
+        write_markdown_html(iter_mapped_lines(path), fp, cache)
+        return None
+    with open(path, encoding="utf-8") as source:
+        write_markdown_html(source, fp, cache)
+    return None
+
+
+def convert_markdown_file(source_path, target_path, cache=None):
+    with open(target_path, "wb") as target, open(source_path, encoding="utf-8") as source:
+        write_markdown_html_bytes(source, target, cache)
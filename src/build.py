@@ -0,0 +1,291 @@
+"""Convert a content directory of markdown files into HTML pages.
+
+Every `.md` file under `content_dir` is written to the same relative path
+under `output_dir` with an `.html` suffix. A manifest of source content
+hashes is kept in `output_dir`, so a rebuild only converts files whose
+content changed. Files whose size and modification time match the manifest
+are skipped without being read at all.
+
+Sources are hashed and converted as streams, block by block, so a large
+file is never held in memory as a whole. With `jobs` greater than one, the
+pages that need converting are spread over a process pool; each page is
+written only by the worker that converts it, so the output does not depend
+on the worker count.
+
+`build_async` is the same build as an asyncio pipeline: a reader task loads
+sources, converter tasks hand each page to an executor, and a writer task
+saves the HTML. Reads, conversions and writes overlap, and the bounded
+queues between the stages keep at most `queue_size` pages waiting in each.
+Only sources up to `STREAM_THRESHOLD` bytes travel through the queues;
+larger ones are streamed block by block inside the executor, as `build`
+does, so memory stays bounded by the threshold rather than the largest
+page.
+
+    report = asyncio.run(build_async("content", "public", jobs=4))
+"""
+from block_markdown import convert_markdown_file, markdown_to_html_node, write_markdown_html_bytes
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor
+import asyncio
+import hashlib
+import io
+import json
+import os
+
+
+MANIFEST_NAME = ".build-manifest.json"
+# Bumped whenever the generated HTML changes, so old manifests are ignored.
+MANIFEST_VERSION = 2
+HASH_CHUNK_SIZE = 1 << 20
+# Sources above this many bytes skip the async pipeline's queues.
+STREAM_THRESHOLD = 1 << 20
+
+
+def markdown_to_html(markdown, cache=None):
+    return markdown_to_html_node(markdown, cache).to_html()
+
+
+def find_sources(content_dir):
+    sources = []
+    for root, dirs, files in os.walk(content_dir):
+        for name in files:
+            if name.endswith(".md"):
+                path = os.path.join(root, name)
+                sources.append(os.path.relpath(path, content_dir))
+    sources.sort()
+    return sources
+
+
+def output_path_for(output_dir, source):
+    return os.path.join(output_dir, os.path.splitext(source)[0] + ".html")
+
+
+def load_manifest(path):
+    try:
+        with open(path, encoding="utf-8") as f:
+            manifest = json.load(f)
+    except (OSError, ValueError):
+        return {}
+    if manifest.get("version") != MANIFEST_VERSION:
+        return {}
+    return manifest.get("files", {})
+
+
+def save_manifest(path, files):
+    tmp_path = path + ".tmp"
+    with open(tmp_path, "w", encoding="utf-8") as f:
+        json.dump({"version": MANIFEST_VERSION, "files": files}, f, indent=1, sort_keys=True)
+    os.replace(tmp_path, path)
+
+
+def file_digest(path):
+    digest = hashlib.sha256()
+    with open(path, "rb") as f:
+        for chunk in iter(lambda: f.read(HASH_CHUNK_SIZE), b""):
+            digest.update(chunk)
+    return digest.hexdigest()
+
+
+def convert_files(sources, targets, jobs=1, cache=None):
+    """Convert each source markdown file into its target HTML file."""
+    for target in targets:
+        os.makedirs(os.path.dirname(target), exist_ok=True)
+    if jobs <= 1 or len(sources) <= 1:
+        for source, target in zip(sources, targets):
+            convert_markdown_file(source, target, cache)
+        return
+    chunksize = max(1, len(sources) // (jobs * 4))
+    with ProcessPoolExecutor(max_workers=jobs) as executor:
+        # Consume the results so worker errors are raised here.
+        for _ in executor.map(convert_markdown_file, sources, targets, chunksize=chunksize):
+            pass
+
+
+def _check_cache(cache, jobs):
+    if cache is not None and jobs > 1:
+        raise ValueError("an inline render cache can only be used with jobs=1")
+
+
+def _plan_build(content_dir, output_dir, force):
+    """Compare `content_dir` against the manifest in `output_dir`.
+
+    Returns `(manifest_path, old_files, new_files, report, pending)`, where
+    `pending` lists the sources that need converting.
+    """
+    # os.walk yields nothing for a missing directory, which would look
+    # like every page was deleted and remove all of their output.
+    if not os.path.isdir(content_dir):
+        raise NotADirectoryError(f"content directory not found: {content_dir!r}")
+    os.makedirs(output_dir, exist_ok=True)
+    manifest_path = os.path.join(output_dir, MANIFEST_NAME)
+    old_files = {} if force else load_manifest(manifest_path)
+    new_files = {}
+    report = {"built": [], "skipped": [], "removed": []}
+    pending = []
+
+    for source in find_sources(content_dir):
+        source_path = os.path.join(content_dir, source)
+        target = output_path_for(output_dir, source)
+        st = os.stat(source_path)
+        entry = old_files.get(source)
+        have_output = entry is not None and os.path.exists(target)
+
+        if have_output and entry["mtime_ns"] == st.st_mtime_ns and entry["size"] == st.st_size:
+            new_files[source] = entry
+            report["skipped"].append(source)
+            continue
+
+        digest = file_digest(source_path)
+        new_files[source] = {"mtime_ns": st.st_mtime_ns, "size": st.st_size, "sha256": digest}
+
+        if have_output and entry["sha256"] == digest:
+            report["skipped"].append(source)
+            continue
+
+        pending.append(source)
+
+    return manifest_path, old_files, new_files, report, pending
+
+
+def _finish_build(output_dir, manifest_path, old_files, new_files, report, pending):
+    report["built"].extend(pending)
+
+    for source in sorted(old_files.keys() - new_files.keys()):
+        try:
+            os.remove(output_path_for(output_dir, source))
+        except FileNotFoundError:
+            pass
+        report["removed"].append(source)
+
+    save_manifest(manifest_path, new_files)
+    return report
+
+
+def build(content_dir, output_dir, force=False, jobs=1, cache=None):
+    """Build `content_dir` into `output_dir` and return a report dict with
+    the `built`, `skipped` and `removed` source paths.
+
+    `cache` is an optional render_cache.RenderCache for inline snippets.
+    It lives in this process, so it cannot be combined with `jobs` > 1.
+    """
+    _check_cache(cache, jobs)
+    manifest_path, old_files, new_files, report, pending = _plan_build(content_dir, output_dir, force)
+    convert_files(
+        [os.path.join(content_dir, source) for source in pending],
+        [output_path_for(output_dir, source) for source in pending],
+        jobs,
+        cache,
+    )
+    return _finish_build(output_dir, manifest_path, old_files, new_files, report, pending)
+
+
+def _read_small_text(path):
+    # None for a source too large to hold in the pipeline's queues.
+    with open(path, encoding="utf-8") as f:
+        if os.fstat(f.fileno()).st_size > STREAM_THRESHOLD:
+            return None
+        return f.read()
+
+
+def _stream_file(source_path, target_path, cache=None):
+    os.makedirs(os.path.dirname(target_path), exist_ok=True)
+    convert_markdown_file(source_path, target_path, cache)
+
+
+def _markdown_to_html_bytes(markdown, cache=None):
+    # The same line splitting and encoding as convert_markdown_file, so
+    # both build modes write the same bytes.
+    buffer = bytearray()
+    write_markdown_html_bytes(io.StringIO(markdown), buffer, cache)
+    return bytes(buffer)
+
+
+def _write_bytes(path, data):
+    os.makedirs(os.path.dirname(path), exist_ok=True)
+    with open(path, "wb") as f:
+        f.write(data)
+
+
+async def _run_stages(coroutines):
+    """Run the pipeline stages together; the first failure cancels the rest
+    and is raised."""
+    tasks = [asyncio.ensure_future(coroutine) for coroutine in coroutines]
+    try:
+        done, _ = await asyncio.wait(tasks, return_when=asyncio.FIRST_EXCEPTION)
+        for task in done:
+            task.result()
+    finally:
+        for task in tasks:
+            task.cancel()
+        await asyncio.gather(*tasks, return_exceptions=True)
+
+
+async def convert_files_async(sources, targets, jobs=1, cache=None, queue_size=None):
+    """Convert each source markdown file into its target HTML file through
+    a read -> convert -> write pipeline.
+
+    Conversions run in a process pool of `jobs` workers, or in a single
+    worker thread when `jobs` is 1. Each queue between the stages holds at
+    most `queue_size` pages (default: two per worker), so a slow stage
+    holds back the ones feeding it instead of letting pages pile up.
+    Sources over `STREAM_THRESHOLD` bytes are not read by the reader:
+    their worker converts them file to file, block by block.
+    """
+    workers = max(1, jobs)
+    if queue_size is None:
+        queue_size = 2 * workers
+    loop = asyncio.get_running_loop()
+    read_queue = asyncio.Queue(queue_size)
+    write_queue = asyncio.Queue(queue_size)
+
+    async def read_sources():
+        for source, target in zip(sources, targets):
+            markdown = await asyncio.to_thread(_read_small_text, source)
+            await read_queue.put((source, target, markdown))
+        for _ in range(workers):
+            await read_queue.put(None)
+
+    async def convert_pages(executor):
+        while (item := await read_queue.get()) is not None:
+            source, target, markdown = item
+            if markdown is None:
+                await loop.run_in_executor(executor, _stream_file, source, target, cache)
+                continue
+            html = await loop.run_in_executor(executor, _markdown_to_html_bytes, markdown, cache)
+            await write_queue.put((target, html))
+        await write_queue.put(None)
+
+    async def write_pages():
+        running = workers
+        while running:
+            item = await write_queue.get()
+            if item is None:
+                running -= 1
+                continue
+            await asyncio.to_thread(_write_bytes, *item)
+
+    if workers > 1:
+        executor = ProcessPoolExecutor(max_workers=workers)
+    else:
+        # One thread keeps a render cache on a single thread; file I/O
+        # releases the GIL, so it still overlaps with the conversion.
+        executor = ThreadPoolExecutor(max_workers=1)
+    with executor:
+        await _run_stages([read_sources(), *(convert_pages(executor) for _ in range(workers)), write_pages()])
+
+
+async def build_async(content_dir, output_dir, force=False, jobs=1, cache=None, queue_size=None):
+    """`build` with reading, converting and writing overlapped; see
+    `convert_files_async`. Returns the same report and writes the same
+    output and manifest."""
+    _check_cache(cache, jobs)
+    manifest_path, old_files, new_files, report, pending = await asyncio.to_thread(
+        _plan_build, content_dir, output_dir, force
+    )
+    await convert_files_async(
+        [os.path.join(content_dir, source) for source in pending],
+        [output_path_for(output_dir, source) for source in pending],
+        jobs,
+        cache,
+        queue_size,
+    )
+    return await asyncio.to_thread(_finish_build, output_dir, manifest_path, old_files, new_files, report, pending)
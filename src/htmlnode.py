@@ -1,18 +1,199 @@
+from time import perf_counter
+import instrument
+
+
+# Attribute strings for props dicts seen before, bounded to
+# _PROPS_CACHE_SIZE entries with the least recently used evicted first.
+# Dicts keep insertion order, so the first key is always the LRU entry.
+_PROPS_CACHE_SIZE = 1024
+_props_cache = {}
+
+
+def _render_props(items):
+    return "".join([f' {key}="{value}"' for key, value in items])
+
+
+def _remember_props(items, props_str):
+    # Only all-str props are cached: 1, 1.0 and True compare equal but
+    # render differently, while a str never equals another type.
+    for key, value in items:
+        if type(key) is not str or type(value) is not str:
+            return
+    if len(_props_cache) >= _PROPS_CACHE_SIZE:
+        del _props_cache[next(iter(_props_cache))]
+    _props_cache[items] = props_str
+
+
+def clear_props_cache():
+    _props_cache.clear()
+
+
+# Number of str chunks joined and encoded at a time by the bytes
+# renderers; encoding every small chunk on its own costs more than the
+# rendering.
+_ENCODE_BATCH = 512
+
+
+def _encode_batches(chunks):
+    # Chunks that are already bytes (frozen subtrees) pass through as is.
+    pending = []
+    for chunk in chunks:
+        if type(chunk) is bytes:
+            if pending:
+                yield "".join(pending).encode()
+                pending.clear()
+            yield chunk
+            continue
+        pending.append(chunk)
+        if len(pending) >= _ENCODE_BATCH:
+            yield "".join(pending).encode()
+            pending.clear()
+    if pending:
+        yield "".join(pending).encode()
+
+
+def _count_nodes(root):
+    count = 0
+    stack = [root]
+    while stack:
+        node = stack.pop()
+        count += 1
+        if node.children:
+            stack.extend(node.children)
+    return count
+
+
 class HtmlNode:
+    __slots__ = ("tag", "value", "children", "props")
+
     def __init__(self, tag = None, value = None, children = None, props = None):
         self.tag = tag
         self.value = value
         self.children = children 
         self.props = props 
+    def iter_html(self):
+        # Subclasses that only override to_html, the original extension
+        # point, render as that one chunk.
+        if type(self).to_html is HtmlNode.to_html:
+            raise NotImplementedError("to_html method not implemented")
+        yield self.to_html()
     def to_html(self):
-        raise NotImplementedError("to_html method not implemented")
+        if instrument.hook is None:
+            return "".join(self.iter_html())
+        start = perf_counter()
+        html = "".join(self.iter_html())
+        instrument.hook("HtmlNode.to_html", perf_counter() - start, _count_nodes(self))
+        return html
+    def write_html(self, fp):
+        # Stream the document into a file-like object without building it
+        # as one string first.
+        hook = instrument.hook
+        start = perf_counter() if hook is not None else 0.0
+        write = fp.write
+        for chunk in self.iter_html():
+            write(chunk)
+        if hook is not None:
+            hook("HtmlNode.write_html", perf_counter() - start, _count_nodes(self))
+    def iter_html_bytes(self):
+        return _encode_batches(self.iter_html())
+    def to_html_bytes(self):
+        """The HTML as UTF-8 bytes, encoded a batch of chunks at a time
+        rather than as one finished str."""
+        if instrument.hook is None:
+            return self._html_bytes()
+        start = perf_counter()
+        html = self._html_bytes()
+        instrument.hook("HtmlNode.to_html_bytes", perf_counter() - start, _count_nodes(self))
+        return html
+    def _html_bytes(self):
+        # Holds about half the memory of to_html().encode(): no full-size
+        # str, only the growing buffer and its final copy.
+        buffer = bytearray()
+        extend = buffer.extend
+        for chunk in self.iter_html_bytes():
+            extend(chunk)
+        return bytes(buffer)
+    def write_html_bytes(self, buffer):
+        # Stream UTF-8 into a bytearray or a binary file-like object
+        # without building the document first.
+        hook = instrument.hook
+        start = perf_counter() if hook is not None else 0.0
+        write = buffer.extend if isinstance(buffer, bytearray) else buffer.write
+        for chunk in self.iter_html_bytes():
+            write(chunk)
+        if hook is not None:
+            hook("HtmlNode.write_html_bytes", perf_counter() - start, _count_nodes(self))
     def props_to_html(self):
-        if not self.props:
+        props = self.props
+        if not props:
             return ""
-        props_str = ""
-        for key, value in self.props.items():
-            props_str += f' {key}="{value}"'
+        if len(props) == 1:
+            # One attribute formats faster than its cache key is built.
+            for key, value in props.items():
+                return f' {key}="{value}"'
+        # Keyed on a snapshot of the items, so mutating or replacing a
+        # node's props can never return a stale string.
+        key = tuple(props.items())
+        try:
+            props_str = _props_cache.pop(key, None)
+        except TypeError:
+            return _render_props(key)
+        if props_str is None:
+            props_str = _render_props(key)
+            _remember_props(key, props_str)
+        else:
+            # Re-inserting a hit makes it the most recently used entry.
+            _props_cache[key] = props_str
         return props_str
+    def freeze(self):
+        """Return a frozen copy of this subtree. Its HTML is rendered once
+        and reused by later renders, including renders of any tree the
+        copy is placed in. This tree itself is left as it is.
+
+        The copy's nodes, children lists and props dicts track changes:
+        any change made through the copy (assigning an attribute, mutating
+        children or props) drops the cached HTML, and the copy renders
+        normally from then on. Copies and pickles of a frozen node are
+        plain, unfrozen nodes.
+        """
+        record = _FrozenHtml(None, None)
+        copies = {}
+        pairs = []
+        stack = [self]
+        while stack:
+            node = stack.pop()
+            if id(node) in copies:
+                continue
+            tracked_class = _TRACKED_CLASSES.get(type(node))
+            if tracked_class is None:
+                raise TypeError(f"Cannot freeze {type(node).__name__} nodes")
+            copy = object.__new__(tracked_class)
+            copies[id(node)] = copy
+            pairs.append((node, copy))
+            if node.children:
+                stack.extend(node.children)
+        # Nodes shared within the subtree stay shared in the copy.
+        for node, copy in pairs:
+            children = node.children
+            if children is not None:
+                children = _TrackedList(copy, [copies[id(child)] for child in children])
+            props = node.props
+            if props is not None:
+                props = _TrackedDict(copy, props)
+            object.__setattr__(copy, "_frozen", record)
+            object.__setattr__(copy, "tag", node.tag)
+            object.__setattr__(copy, "value", node.value)
+            object.__setattr__(copy, "children", children)
+            object.__setattr__(copy, "props", props)
+        root = copies[id(self)]
+        record.root = root
+        record.html = "".join(root.iter_html())
+        return root
+    def thaw(self):
+        """Drop the HTML cached for a frozen copy; a no-op on other nodes."""
+    @property
+    def frozen(self):
+        return False
     def __repr__(self):
         return f"HtmlNode(tag={self.tag}, value={self.value}, children={self.children}, props={self.props})"
 
@@ -20,10 +201,34 @@ class HtmlNode:
     
 
 class LeafNode(HtmlNode):
+    __slots__ = ()
+
     def __init__(self, tag = None, value = None, props = None):
         super().__init__(tag=tag, value=value, children=None, props=props)
 
+    def iter_html(self):
+        yield self._leaf_html()
+
     def to_html(self):
+        if instrument.hook is None:
+            return self._leaf_html()
+        start = perf_counter()
+        html = self._leaf_html()
+        instrument.hook("HtmlNode.to_html", perf_counter() - start, 1)
+        return html
+
+    def iter_html_bytes(self):
+        yield self._leaf_html_bytes()
+
+    def to_html_bytes(self):
+        if instrument.hook is None:
+            return self._leaf_html_bytes()
+        start = perf_counter()
+        html = self._leaf_html_bytes()
+        instrument.hook("HtmlNode.to_html_bytes", perf_counter() - start, 1)
+        return html
+
+    def _leaf_html(self):
         if self.value is None:
               raise ValueError("Leaf nodes must have a value")
         if self.tag is None:
@@ -31,17 +236,222 @@ class LeafNode(HtmlNode):
         props_str = self.props_to_html()
         return f"<{self.tag}{props_str}>{self.value}</{self.tag}>"
 
+    def _leaf_html_bytes(self):
+        return self._leaf_html().encode()
+
     
 
 class ParentNode(HtmlNode):
+    __slots__ = ()
+
     def __init__(self, tag = None, children = None, props = None):
         super().__init__(tag=tag, value=None, children=children, props=props)
 
-    def to_html(self):
+    def _open_tag(self):
         if self.tag is None:
             raise ValueError("Parent nodes must have a tag")
         if self.children is None:
             raise ValueError("Parent nodes must have children")
         props_str = self.props_to_html()
-        children_html = "".join(child.to_html() for child in self.children) if self.children else ""
-        return f"<{self.tag}{props_str}>{children_html}</{self.tag}>"
\ No newline at end of file
+        return f"<{self.tag}{props_str}>"
+
+    def iter_html(self):
+        return self._walk(_frozen_html)
+
+    def iter_html_bytes(self):
+        # Frozen subtrees are spliced in as their cached UTF-8 bytes.
+        return _encode_batches(self._walk(_frozen_bytes))
+
+    def _walk(self, frozen):
+        # Walk the tree with an explicit stack of child iterators instead of
+        # recursing, so nesting depth is not bound by the interpreter's
+        # recursion limit. `frozen` returns the cached HTML of a frozen
+        # child, as str or bytes, or None.
+        # Runs of sibling leaves are joined into one chunk, so a wide list
+        # of leaves costs one yield rather than one per leaf.
+        yield self._open_tag()
+        stack = [(iter(self.children), self.tag)]
+        while stack:
+            children, tag = stack[-1]
+            leaves = []
+            for child in children:
+                if isinstance(child, LeafNode):
+                    leaves.append(child._leaf_html())
+                    continue
+                if leaves:
+                    yield "".join(leaves)
+                    leaves = []
+                if isinstance(child, ParentNode):
+                    if type(child) is _TrackedParentNode:
+                        html = frozen(child)
+                        if html is not None:
+                            yield html
+                            continue
+                    yield child._open_tag()
+                    stack.append((iter(child.children), child.tag))
+                    break
+                yield from child.iter_html()
+            else:
+                if leaves:
+                    yield "".join(leaves)
+                stack.pop()
+                yield f"</{tag}>"
+
+
+
+class _FrozenHtml:
+    # The HTML cached for one frozen copy, shared by all of its nodes;
+    # `html` is None once any of them has changed. `data` is its UTF-8
+    # encoding, made on first use.
+    __slots__ = ("root", "html", "data")
+
+    def __init__(self, root, html):
+        self.root = root
+        self.html = html
+        self.data = None
+
+
+def _frozen_html(node):
+    if type(node) not in _TRACKED_CLASS_SET:
+        return None
+    record = node._frozen
+    return record.html if record.root is node else None
+
+
+def _frozen_bytes(node):
+    if type(node) not in _TRACKED_CLASS_SET:
+        return None
+    record = node._frozen
+    if record.root is not node or record.html is None:
+        return None
+    if record.data is None:
+        record.data = record.html.encode()
+    return record.data
+
+
+def _thaw(record):
+    if record is not None:
+        record.html = None
+        record.data = None
+
+
+class _TrackedList(list):
+    __slots__ = ("_owner",)
+
+    def __init__(self, owner, items):
+        super().__init__(items)
+        self._owner = owner
+
+    def _changed(self):
+        _thaw(self._owner._frozen)
+
+    def __reduce__(self):
+        return (list, (list(self),))
+
+
+class _TrackedDict(dict):
+    __slots__ = ("_owner",)
+
+    def __init__(self, owner, items):
+        super().__init__(items)
+        self._owner = owner
+
+    def _changed(self):
+        _thaw(self._owner._frozen)
+
+    def __reduce__(self):
+        return (dict, (dict(self),))
+
+
+def _tracking(base, name):
+    method = getattr(base, name)
+    def mutate(self, *args, **kwargs):
+        result = method(self, *args, **kwargs)
+        self._changed()
+        return result
+    mutate.__name__ = name
+    return mutate
+
+
+for _name in ("__setitem__", "__delitem__", "__iadd__", "__imul__", "append", "extend",
+              "insert", "pop", "remove", "clear", "sort", "reverse"):
+    setattr(_TrackedList, _name, _tracking(list, _name))
+for _name in ("__setitem__", "__delitem__", "__ior__", "pop", "popitem", "clear", "update", "setdefault"):
+    setattr(_TrackedDict, _name, _tracking(dict, _name))
+del _name
+
+
+class _TrackedMixin:
+    __slots__ = ()
+
+    def __setattr__(self, name, value):
+        object.__setattr__(self, name, value)
+        _thaw(getattr(self, "_frozen", None))
+
+    def __delattr__(self, name):
+        object.__delattr__(self, name)
+        _thaw(getattr(self, "_frozen", None))
+
+    def __reduce_ex__(self, protocol):
+        # Copies and pickles are plain, unfrozen nodes.
+        return (_plain_node, (_PLAIN_CLASSES[type(self)], self.tag, self.value, self.children, self.props))
+
+    def thaw(self):
+        if self._frozen.root is self:
+            _thaw(self._frozen)
+
+    @property
+    def frozen(self):
+        return _frozen_html(self) is not None
+
+
+class _TrackedLeafNode(_TrackedMixin, LeafNode):
+    # The _FrozenHtml record shared by every node of the frozen copy.
+    __slots__ = ("_frozen",)
+
+    def _leaf_html(self):
+        html = _frozen_html(self)
+        if html is not None:
+            return html
+        return super()._leaf_html()
+
+    def _leaf_html_bytes(self):
+        html = _frozen_bytes(self)
+        if html is not None:
+            return html
+        return super()._leaf_html_bytes()
+
+
+class _TrackedParentNode(_TrackedMixin, ParentNode):
+    __slots__ = ("_frozen",)
+
+    def iter_html(self):
+        html = _frozen_html(self)
+        if html is not None:
+            yield html
+            return
+        yield from super().iter_html()
+
+    def iter_html_bytes(self):
+        html = _frozen_bytes(self)
+        if html is not None:
+            yield html
+            return
+        yield from super().iter_html_bytes()
+
+
+# Node class -> the class of its copy in a frozen subtree.
+_TRACKED_CLASSES = {
+    LeafNode: _TrackedLeafNode,
+    ParentNode: _TrackedParentNode,
+    _TrackedLeafNode: _TrackedLeafNode,
+    _TrackedParentNode: _TrackedParentNode,
+}
+_TRACKED_CLASS_SET = frozenset((_TrackedLeafNode, _TrackedParentNode))
+_PLAIN_CLASSES = {_TrackedLeafNode: LeafNode, _TrackedParentNode: ParentNode}
+
+
+def _plain_node(cls, tag, value, children, props):
+    node = object.__new__(cls)
+    HtmlNode.__init__(node, tag, value, children, props)
+    return node
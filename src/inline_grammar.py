@@ -0,0 +1,43 @@
+"""Inline markdown grammar shared by the splitting functions and the
+single-pass tokenizer.
+
+Every pattern is compiled once at import time. `IMAGE_OR_LINK_PATTERN`
+matches either an image or a link, so one `finditer` sweep finds both:
+images fill groups 1 and 2, links fill groups 3 and 4, and `lastindex`
+tells the two apart.
+"""
+from textnode import TextType
+import re
+
+
+IMAGE_REGEX = r"!\[([^\[\]]*)\]\(([^\(\)]*)\)"
+LINK_BODY_REGEX = r"\[([^\[\]]*)\]\(([^\(\)]*)\)"
+LINK_REGEX = r"(?<!!)" + LINK_BODY_REGEX
+
+IMAGE_PATTERN = re.compile(IMAGE_REGEX)
+LINK_PATTERN = re.compile(LINK_REGEX)
+# A link without the "not after !" check, for matching at the start of a
+# span whose preceding "!" lies outside the span.
+LINK_BODY_PATTERN = re.compile(LINK_BODY_REGEX)
+# The lookahead gives the regex engine a literal first character to skip
+# ahead to; without it the leading lookbehind of LINK_REGEX makes it try
+# the alternation at every position, which is slower on plain prose than
+# the two separate passes.
+IMAGE_OR_LINK_PATTERN = re.compile(f"(?=[!\\[])(?:{IMAGE_REGEX}|{LINK_REGEX})")
+
+# `lastindex` of an IMAGE_OR_LINK_PATTERN match -> (type, label group, url group)
+IMAGE_OR_LINK_GROUPS = {
+    2: (TextType.image, 1, 2),
+    4: (TextType.link, 3, 4),
+}
+
+CODE_DELIMITER = "`"
+BOLD_DELIMITER = "**"
+ITALIC_DELIMITER = "*"
+
+# Delimiters in the order text_to_textnodes applies them.
+DELIMITERS = (
+    (CODE_DELIMITER, TextType.codetext),
+    (BOLD_DELIMITER, TextType.bold),
+    (ITALIC_DELIMITER, TextType.italic),
+)
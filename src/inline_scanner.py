@@ -0,0 +1,134 @@
+"""Single-pass inline tokenizer.
+
+`tokenize_inline(text)` produces the same `TextNode` sequence as
+`markdown_to_text.text_to_textnodes`, but walks the source text once
+instead of running five split passes that each rebuild the node list.
+Only the final spans are sliced out of the source; no intermediate
+plaintext nodes are created.
+
+With `spans=True` the nodes are `TextSpan`s over the input string, so not
+even the final spans are copied out of it.
+
+`text_to_textnodes` stays the reference implementation. Errors are raised
+with the same messages and in the same priority the reference passes
+would produce them: unmatched code first, then bold, then italic.
+
+With `strict=False` nothing is raised: an unmatched delimiter is kept as
+literal text, and a literal "**" is not re-read as two italic delimiters.
+Every search moves forward only, so the scan is linear in the text length
+in both modes.
+"""
+from textnode import TextNode, TextSpan, TextType
+from inline_grammar import IMAGE_OR_LINK_PATTERN, IMAGE_OR_LINK_GROUPS
+
+
+def _unmatched(delimiter, text):
+    return Exception(f"Unmatched delimiter '{delimiter}' in text: {text!r}")
+
+
+def _piece(spans, text, start, end, text_type, url = None):
+    if spans:
+        return TextSpan(text, start, end, text_type, url)
+    return TextNode(text[start:end], text_type, url)
+
+
+def tokenize_inline(text, spans=False, strict=True):
+    if text == "":
+        return [_piece(spans, "", 0, 0, TextType.plaintext)]
+    # Backticks pair up left to right, so an odd count is exactly an
+    # unmatched code span, the highest priority error.
+    if strict and text.count("`") % 2:
+        raise _unmatched("`", text)
+
+    nodes = []
+    # With no code error possible, an unmatched "**" is raised as soon as
+    # it is found. Italic errors wait until the whole text has been
+    # scanned, so that an unmatched "**" further on still wins. Without
+    # `strict` there are no errors and unmatched delimiters are literal.
+    errors = [None] if strict else None
+    i = 0
+    n = len(text)
+
+    while i < n:
+        idx = text.find("`", i)
+        if idx == -1:
+            break
+        j = text.find("`", idx + 1)
+        if j == -1:
+            # Not strict: the backtick is literal.
+            break
+        if idx > i:
+            _scan_segment(text, i, idx, nodes, errors, spans)
+        nodes.append(_piece(spans, text, idx + 1, j, TextType.codetext))
+        i = j + 1
+
+    if i < n:
+        _scan_segment(text, i, n, nodes, errors, spans)
+    if errors is not None and errors[0] is not None:
+        raise errors[0]
+    return nodes
+
+
+def _scan_segment(text, lo, hi, nodes, errors, spans):
+    pos = lo
+    for match in IMAGE_OR_LINK_PATTERN.finditer(text, lo, hi):
+        start, end = match.span()
+        if start > pos:
+            _scan_emphasis(text, pos, start, nodes, errors, spans)
+        text_type, label_group, url_group = IMAGE_OR_LINK_GROUPS[match.lastindex]
+        nodes.append(_piece(spans, text, match.start(label_group), match.end(label_group), text_type, match.group(url_group)))
+        pos = end
+
+    if pos < hi:
+        _scan_emphasis(text, pos, hi, nodes, errors, spans)
+
+
+def _scan_emphasis(text, lo, hi, nodes, errors, spans):
+    i = lo
+    while i < hi:
+        idx = text.find("**", i, hi)
+        if idx == -1:
+            break
+        j = text.find("**", idx + 2, hi)
+        if j == -1:
+            if errors is not None:
+                raise _unmatched("**", text[lo:hi])
+            # This "**" is literal, so the italic scan must not pair its
+            # two stars; no other "**" follows it.
+            _scan_italic(text, i, hi, nodes, errors, spans, idx)
+            return
+        if idx > i:
+            _scan_italic(text, i, idx, nodes, errors, spans)
+        nodes.append(_piece(spans, text, idx + 2, j, TextType.bold))
+        i = j + 2
+
+    if i < hi:
+        _scan_italic(text, i, hi, nodes, errors, spans)
+
+
+def _scan_italic(text, lo, hi, nodes, errors, spans, literal=None):
+    if errors is not None and text.count("*", lo, hi) % 2:
+        if errors[0] is None:
+            errors[0] = _unmatched("*", text[lo:hi])
+        return
+
+    plain = i = lo
+    while True:
+        idx = text.find("*", i, hi)
+        if idx == literal:
+            idx = text.find("*", literal + 2, hi)
+        if idx == -1:
+            break
+        j = text.find("*", idx + 1, hi)
+        if j == literal:
+            j = text.find("*", literal + 2, hi)
+        if j == -1:
+            # Not strict: the rest is literal.
+            break
+        if idx > plain:
+            nodes.append(_piece(spans, text, plain, idx, TextType.plaintext))
+        nodes.append(_piece(spans, text, idx + 1, j, TextType.italic))
+        plain = i = j + 1
+
+    if plain < hi:
+        nodes.append(_piece(spans, text, plain, hi, TextType.plaintext))
@@ -0,0 +1,92 @@
+"""Per-stage timing hooks for the conversion hot paths.
+
+Instrumented functions check the module-level `hook` and do nothing extra
+while it is None, so the disabled cost is one global lookup per call. When
+a hook is installed, each instrumented call reports
+`hook(stage, seconds, nodes)`.
+
+Instrumented stages:
+- split_nodes_delimiter, split_nodes_image, split_nodes_link and
+  split_nodes_image_link (the combined sweep text_to_textnodes uses)
+- text_node_to_html_node
+- HtmlNode.to_html, HtmlNode.write_html and their _bytes variants
+  (outermost calls only)
+
+`Recorder` is a hook that sums call counts, wall time and nodes per stage:
+
+    with recording() as recorder:
+        build("content", "public")
+    recorder.write_json("profile.json")
+"""
+from contextlib import contextmanager
+from time import perf_counter
+import json
+
+
+hook = None
+
+
+def set_hook(new_hook):
+    """Install `new_hook` (or None to disable) and return the previous one."""
+    global hook
+    previous = hook
+    hook = new_hook
+    return previous
+
+
+def timed_list(stage, iterable, collect = list):
+    """Drain `iterable` into a list (or whatever `collect` builds) and report
+    the time taken and the length to the installed hook."""
+    current = hook
+    start = perf_counter()
+    nodes = collect(iterable)
+    if current is not None:
+        current(stage, perf_counter() - start, len(nodes))
+    return nodes
+
+
+class StageStats:
+    __slots__ = ("calls", "seconds", "nodes")
+
+    def __init__(self):
+        self.calls = 0
+        self.seconds = 0.0
+        self.nodes = 0
+
+    def to_dict(self):
+        return {"calls": self.calls, "seconds": self.seconds, "nodes": self.nodes}
+
+
+class Recorder:
+    def __init__(self):
+        self.stages = {}
+
+    def __call__(self, stage, seconds, nodes):
+        stats = self.stages.get(stage)
+        if stats is None:
+            stats = self.stages[stage] = StageStats()
+        stats.calls += 1
+        stats.seconds += seconds
+        stats.nodes += nodes
+
+    def report(self):
+        return {
+            "stages": {stage: self.stages[stage].to_dict() for stage in sorted(self.stages)},
+            "total_seconds": sum(stats.seconds for stats in self.stages.values()),
+        }
+
+    def write_json(self, path):
+        with open(path, "w", encoding="utf-8") as f:
+            json.dump(self.report(), f, indent=1)
+
+
+@contextmanager
+def recording(recorder=None):
+    """Install a Recorder for the duration of the block and yield it."""
+    if recorder is None:
+        recorder = Recorder()
+    previous = set_hook(recorder)
+    try:
+        yield recorder
+    finally:
+        set_hook(previous)
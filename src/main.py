@@ -1,5 +1,15 @@
+import argparse
+import asyncio
+import sys
+
 from textnode import TextNode, TextType
-def main():
+from build import build, build_async
+from render_cache import RenderCache
+from watch import Watcher
+import instrument
+
+
+def sample():
     node1 = TextNode("This is some anchor text", TextType.link, "https://www.boot.dev")
     node2 = TextNode("This is some anchor text", TextType.link, "https://www.boot.dev")
     print(f"node1: {node1}")
@@ -12,5 +22,76 @@ def main():
     print(f"node1 == node2: {node1 == node2}")
     print(f"node1 == node3: {node1 == node3}")
 
+
+def parse_args(argv):
+    parser = argparse.ArgumentParser(description="Static website generator")
+    commands = parser.add_subparsers(dest="command")
+
+    build_parser = commands.add_parser("build", help="convert markdown content into HTML")
+    build_parser.add_argument("--content", default="content", help="markdown source directory")
+    build_parser.add_argument("--output", default="public", help="HTML output directory")
+    build_parser.add_argument("--force", action="store_true", help="ignore the manifest and rebuild every page")
+    build_parser.add_argument("--jobs", "-j", type=int, default=1, help="number of worker processes")
+    build_parser.add_argument(
+        "--async", dest="use_async", action="store_true",
+        help="overlap file reads and writes with conversion",
+    )
+    build_parser.add_argument("--inline-cache", metavar="PATH", help="persistent cache file for rendered inline snippets")
+    build_parser.add_argument(
+        "--profile", metavar="PATH",
+        help="write per-stage timings as JSON (covers this process only, so use --jobs 1 for a full profile)",
+    )
+
+    watch_parser = commands.add_parser("watch", help="build, then rebuild pages as their sources change")
+    watch_parser.add_argument("--content", default="content", help="markdown source directory")
+    watch_parser.add_argument("--output", default="public", help="HTML output directory")
+    watch_parser.add_argument("--interval", type=float, default=0.5, help="seconds between polls")
+
+    return parser.parse_args(argv)
+
+
+def print_rebuild(report):
+    for source in report["built"]:
+        print(f"built {source}")
+    for source in report["removed"]:
+        print(f"removed {source}")
+    for source, error in report["errors"].items():
+        print(f"error in {source}: {error}")
+    print(f"blocks rendered {report['rendered']}, reused {report['reused']}")
+
+
+def main(argv=None):
+    args = parse_args(sys.argv[1:] if argv is None else argv)
+    if args.command == "build":
+        cache = RenderCache(path=args.inline_cache) if args.inline_cache else None
+        recorder = instrument.Recorder() if args.profile else None
+        previous_hook = instrument.set_hook(recorder) if recorder is not None else None
+        try:
+            if args.use_async:
+                report = asyncio.run(build_async(args.content, args.output, force=args.force, jobs=args.jobs, cache=cache))
+            else:
+                report = build(args.content, args.output, force=args.force, jobs=args.jobs, cache=cache)
+        finally:
+            if recorder is not None:
+                instrument.set_hook(previous_hook)
+            if cache is not None:
+                cache.close()
+        if recorder is not None:
+            recorder.write_json(args.profile)
+        print(f"built {len(report['built'])}, skipped {len(report['skipped'])}, removed {len(report['removed'])}")
+        if cache is not None:
+            print(f"inline cache: {cache.stats()}")
+    elif args.command == "watch":
+        watcher = Watcher(args.content, args.output)
+        report = watcher.start()
+        print(f"built {len(report['built'])}, skipped {len(report['skipped'])}, removed {len(report['removed'])}")
+        print(f"watching {args.content} (Ctrl-C to stop)")
+        try:
+            watcher.run(interval=args.interval, on_rebuild=print_rebuild)
+        except KeyboardInterrupt:
+            pass
+    else:
+        sample()
+
 if __name__ == "__main__":
-    main()
\ No newline at end of file
+    main()
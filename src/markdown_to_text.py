@@ -2,159 +2,248 @@
 segments into `text_type` nodes.
 
 Only nodes with `TextType.plaintext` are inspected and potentially split.
-All other nodes are appended unchanged.
+All other nodes are appended unchanged. `TextSpan` nodes are split in place
+over their source string and produce `TextSpan` pieces, so no text is
+copied.
 
 If a matching closing delimiter is not found for a plaintext node, an
-Exception is raised with a helpful message.
-"""
-from textnode import TextNode, TextType
-import re
-
+Exception is raised with a helpful message. Delimiters pair up left to
+right, so a node has an unmatched delimiter exactly when it holds an odd
+number of them; that is checked with one `str.count` before any piece is
+produced, so bad input fails without allocating a node per pair first.
 
-def split_nodes_delimiter(old_nodes, delimiter, text_type):
-    new_nodes = []
+With `strict=False` an unmatched delimiter is kept as literal text instead.
+Every scan only moves forward, so splitting is linear in the text length
+in both modes.
 
+The `split_nodes_*` functions return a list, or a `TextNodeArray` when
+given one; the pieces are stored as offsets into the array's source.
+"""
+from textnode import TextNode, TextNodeArray, TextSpan, TextType
+from inline_scanner import tokenize_inline
+import instrument
+from inline_grammar import (
+    IMAGE_PATTERN, LINK_PATTERN, LINK_BODY_PATTERN, IMAGE_OR_LINK_PATTERN, IMAGE_OR_LINK_GROUPS,
+    CODE_DELIMITER, BOLD_DELIMITER, ITALIC_DELIMITER,
+)
+
+
+def _node_source(node):
+    # A plaintext node as (source, start, end). Spans are split in place
+    # over their source; plain TextNodes are their own source.
+    if isinstance(node, TextSpan):
+        return node.source, node.start, node.end
+    return node.text, 0, len(node.text)
+
+def _piece(spans, source, start, end, text_type, url):
+    if spans:
+        return TextSpan(source, start, end, text_type, url)
+    return TextNode(source[start:end], text_type, url)
+
+def iter_split_nodes_delimiter(old_nodes, delimiter, text_type, strict=True):
     for node in old_nodes:
         # Only attempt to split plaintext nodes
         if node.text_type != TextType.plaintext:
-            new_nodes.append(node)
+            yield node
             continue
 
-        text = node.text
-        i = 0
+        spans = isinstance(node, TextSpan)
+        text, i, end = _node_source(node)
         dlen = len(delimiter)
 
         # Special case for empty string - add it as is
-        if text == "":
-            new_nodes.append(TextNode("", TextType.plaintext, node.url))
+        if i == end:
+            yield _piece(spans, text, i, i, TextType.plaintext, node.url)
             continue
 
-        while i < len(text):  
+        if strict and text.count(delimiter, i, end) % 2:
+            raise Exception(f"Unmatched delimiter '{delimiter}' in text: {node.text!r}")
+
+        while i < end:  
             # Find next delimiter
-            idx = text.find(delimiter, i)
+            idx = text.find(delimiter, i, end)
             
             # If no delimiter found
             if idx == -1:
-                # Add remaining text if not empty
-                remaining = text[i:]
-                if remaining:
-                    new_nodes.append(TextNode(remaining, TextType.plaintext, node.url))
+                # Add remaining text
+                yield _piece(spans, text, i, end, TextType.plaintext, node.url)
                 break
             
+            # Find closing delimiter. Only reachable without a match when not
+            # strict: the rest of the text, delimiter included, is literal.
+            j = text.find(delimiter, idx + dlen, end)
+            if j == -1:
+                yield _piece(spans, text, i, end, TextType.plaintext, node.url)
+                break
+
             # Add text before delimiter if not empty
             if idx > i:
-                before = text[i:idx]
-                new_nodes.append(TextNode(before, TextType.plaintext, node.url))
-            
-            # Find closing delimiter
-            j = text.find(delimiter, idx + dlen)
-            if j == -1:
-                raise Exception(f"Unmatched delimiter '{delimiter}' in text: {text!r}")
+                yield _piece(spans, text, i, idx, TextType.plaintext, node.url)
             
             # Add delimited content
-            inner = text[idx + dlen:j]
-            new_nodes.append(TextNode(inner, text_type, node.url))
+            yield _piece(spans, text, idx + dlen, j, text_type, node.url)
             
             # Move past the closing delimiter
             i = j + dlen
             
-            # If i == len(text), we're done, no need to add empty node
+            # If i == end, we're done, no need to add empty node
+
 
-    return new_nodes
+def _collect(stage, old_nodes, pieces):
+    # Gather a split generator's output into the caller's kind of sequence.
+    collect = old_nodes.derive if isinstance(old_nodes, TextNodeArray) else list
+    if instrument.hook is None:
+        return collect(pieces)
+    return instrument.timed_list(stage, pieces, collect)
+
+def split_nodes_delimiter(old_nodes, delimiter, text_type, strict=True):
+    return _collect("split_nodes_delimiter", old_nodes, iter_split_nodes_delimiter(old_nodes, delimiter, text_type, strict))
 
 def extract_markdown_images(text):
-    pattern = re.compile(r"!\[([^\[\]]*)\]\(([^\(\)]*)\)")
-    matches = pattern.findall(text)
-    return [(alt, url) for (alt, url) in matches]
+    return IMAGE_PATTERN.findall(text)
 
 def extract_markdown_links(text):
-    pattern = re.compile(r"(?<!!)\[([^\[\]]*)\]\(([^\(\)]*)\)")
-    matches = pattern.findall(text)
-    return [(anchor, link) for (anchor, link) in matches]
+    return LINK_PATTERN.findall(text)
 
-def split_nodes_image(old_nodes):
-    new_nodes = []
-    pattern = re.compile(r"!\[([^\[\]]*)\]\(([^\(\)]*)\)")
-    
+def _leading_link(text, start, end):
+    # The link pattern's lookbehind sees characters before `start`, so a
+    # span right after "!" would lose a link that the same text on its own
+    # matches. Match such a link explicitly; it is the leftmost match.
+    if start > 0 and text[start - 1] == "!":
+        return LINK_BODY_PATTERN.match(text, start, end)
+    return None
+
+def _iter_split_nodes_pattern(old_nodes, pattern, text_type):
     for node in old_nodes:
         if node.text_type != TextType.plaintext:
-            new_nodes.append(node)
+            yield node
             continue 
         
-        text = node.text
-        if text == "":
-            new_nodes.append(TextNode("", TextType.plaintext, node.url))
+        spans = isinstance(node, TextSpan)
+        text, i, end = _node_source(node)
+        if i == end:
+            yield _piece(spans, text, i, i, TextType.plaintext, node.url)
             continue
-        i = 0
-        while i < len(text):
-            match = pattern.search(text, i)
+        if text_type is TextType.link:
+            match = _leading_link(text, i, end)
+            if match:
+                yield _piece(spans, text, match.start(1), match.end(1), text_type, match.group(2))
+                i = match.end()
+        while i < end:
+            match = pattern.search(text, i, end)
             if not match:
-                remaining = text[i:]
-                if remaining:
-                    new_nodes.append(TextNode(remaining, TextType.plaintext, node.url))
+                yield _piece(spans, text, i, end, TextType.plaintext, node.url)
                 break
             
-            start, end = match.span()
+            start, stop = match.span()
             if start > i:
-                before = text[i:start]
-                new_nodes.append(TextNode(before, TextType.plaintext, node.url))
+                yield _piece(spans, text, i, start, TextType.plaintext, node.url)
             
-            alt_text, url = match.groups()
-            new_nodes.append(TextNode(alt_text, TextType.image, url))
-            i = end
-    
-    return new_nodes
+            yield _piece(spans, text, match.start(1), match.end(1), text_type, match.group(2))
+            i = stop
+
+def iter_split_nodes_image(old_nodes):
+    return _iter_split_nodes_pattern(old_nodes, IMAGE_PATTERN, TextType.image)
+
+def split_nodes_image(old_nodes):
+    return _collect("split_nodes_image", old_nodes, iter_split_nodes_image(old_nodes))
+
+def iter_split_nodes_link(old_nodes):
+    return _iter_split_nodes_pattern(old_nodes, LINK_PATTERN, TextType.link)
 
 def split_nodes_link(old_nodes):
-    new_nodes = []
-    pattern = re.compile(r"(?<!!)\[([^\[\]]*)\]\(([^\(\)]*)\)")
-    
+    return _collect("split_nodes_link", old_nodes, iter_split_nodes_link(old_nodes))
+
+def iter_split_nodes_image_link(old_nodes):
+    # One sweep with the combined pattern. Image and link matches never
+    # overlap, so this gives the same nodes as splitting images and then
+    # links, without a second pass over the text.
     for node in old_nodes:
         if node.text_type != TextType.plaintext:
-            new_nodes.append(node)
-            continue 
-        
-        text = node.text
-        if text == "":
-            new_nodes.append(TextNode("", TextType.plaintext, node.url))
+            yield node
             continue
-        i = 0
-        while i < len(text):
-            match = pattern.search(text, i)
-            if not match:
-                remaining = text[i:]
-                if remaining:
-                    new_nodes.append(TextNode(remaining, TextType.plaintext, node.url))
-                break
-            
-            start, end = match.span()
+
+        spans = isinstance(node, TextSpan)
+        text, i, end = _node_source(node)
+        if i == end:
+            yield _piece(spans, text, i, i, TextType.plaintext, node.url)
+            continue
+        match = _leading_link(text, i, end)
+        if match:
+            yield _piece(spans, text, match.start(1), match.end(1), TextType.link, match.group(2))
+            i = match.end()
+        for match in IMAGE_OR_LINK_PATTERN.finditer(text, i, end):
+            start, stop = match.span()
             if start > i:
-                before = text[i:start]
-                new_nodes.append(TextNode(before, TextType.plaintext, node.url))
-            
-            anchor_text, url = match.groups()
-            new_nodes.append(TextNode(anchor_text, TextType.link, url))
-            i = end
-    
-    return new_nodes
+                yield _piece(spans, text, i, start, TextType.plaintext, node.url)
+            text_type, label_group, url_group = IMAGE_OR_LINK_GROUPS[match.lastindex]
+            yield _piece(spans, text, match.start(label_group), match.end(label_group), text_type, match.group(url_group))
+            i = stop
+        if i < end:
+            yield _piece(spans, text, i, end, TextType.plaintext, node.url)
+
+def split_nodes_image_link(old_nodes):
+    return _collect("split_nodes_image_link", old_nodes, iter_split_nodes_image_link(old_nodes))
+
+def iter_split_nodes_code(old_nodes, strict=True):
+    return iter_split_nodes_delimiter(old_nodes, CODE_DELIMITER, TextType.codetext, strict)
+
+def iter_split_nodes_bold(old_nodes, strict=True):
+    return iter_split_nodes_delimiter(old_nodes, BOLD_DELIMITER, TextType.bold, strict)
+
+def iter_split_nodes_italic(old_nodes, strict=True):
+    return iter_split_nodes_delimiter(old_nodes, ITALIC_DELIMITER, TextType.italic, strict)
 
-def split_nodes_code(old_nodes):
-    return split_nodes_delimiter(old_nodes, "`", TextType.codetext)
+def split_nodes_code(old_nodes, strict=True):
+    return split_nodes_delimiter(old_nodes, CODE_DELIMITER, TextType.codetext, strict)
 
-def split_nodes_bold(old_nodes):
-    return split_nodes_delimiter(old_nodes, "**", TextType.bold)
+def split_nodes_bold(old_nodes, strict=True):
+    return split_nodes_delimiter(old_nodes, BOLD_DELIMITER, TextType.bold, strict)
 
-def split_nodes_italic(old_nodes):
-    return split_nodes_delimiter(old_nodes, "*", TextType.italic)
+def split_nodes_italic(old_nodes, strict=True):
+    return split_nodes_delimiter(old_nodes, ITALIC_DELIMITER, TextType.italic, strict)
+
+def iter_text_to_textnodes(text, spans=False):
+    # Each stage pulls one node at a time from the previous one, so the
+    # pipeline never holds more than a node per stage in flight. On invalid
+    # input the first error met in stream order is raised, which can differ
+    # from the pass order used by text_to_textnodes. With `spans` every node
+    # is a TextSpan over `text`.
+    first = TextSpan.from_text(text) if spans else TextNode(text, TextType.plaintext, None)
+    nodes = iter((first,))
+
+    nodes = iter_split_nodes_code(nodes)
+    nodes = iter_split_nodes_image_link(nodes)
+    nodes = iter_split_nodes_bold(nodes)
+    nodes = iter_split_nodes_italic(nodes)
+
+    return nodes
+
+def text_to_textnodes(text, strict=True):
+    # Recovery needs to know which "*" characters a stray "**" left behind,
+    # which the italic pass cannot see, so it goes through the single-pass
+    # tokenizer; on valid input both give the same nodes.
+    if not strict:
+        return tokenize_inline(text, strict=False)
 
-def text_to_textnodes(text):
     nodes = []
     nodes.append(TextNode(text, TextType.plaintext, None))
 
     nodes = split_nodes_code(nodes)
-    nodes = split_nodes_image(nodes)
-    nodes = split_nodes_link(nodes)
+    nodes = split_nodes_image_link(nodes)
+    nodes = split_nodes_bold(nodes)
+    nodes = split_nodes_italic(nodes)
+
+    return nodes
+
+def text_to_textnode_array(text):
+    """text_to_textnodes, with each pass stored in a TextNodeArray over
+    `text` instead of a list of nodes."""
+    nodes = TextNodeArray.from_text(text)
+
+    nodes = split_nodes_code(nodes)
+    nodes = split_nodes_image_link(nodes)
     nodes = split_nodes_bold(nodes)
     nodes = split_nodes_italic(nodes)
 
-    return nodes
\ No newline at end of file
+    return nodes
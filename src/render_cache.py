@@ -0,0 +1,145 @@
+"""Opt-in cache from inline markdown source text to rendered HTML.
+
+Repeated snippets (nav labels, footer links, admonitions) go through
+`text_to_textnodes` and rendering only once. The in-memory tier is an LRU
+bounded by both entry count and size; sizes are measured with
+`sys.getsizeof` on the source and HTML strings. An optional persistent tier
+in a `dbm` file keeps rendered snippets between builds and is read on a
+memory miss. The file is tied to the render function that filled it, and
+when it holds more than `max_disk_entries` snippets on close, those not
+used since it was opened are dropped.
+
+    with RenderCache(max_entries=10_000, path="build/.inline-cache") as cache:
+        html = cache.render("See the [docs](/docs)")
+        print(cache.stats())
+"""
+from collections import OrderedDict
+from markdown_to_text import text_to_textnodes
+from textnode import render_textnodes
+import dbm
+import hashlib
+import sys
+
+
+# Stored in the persistent tier together with the render function's name;
+# bump when rendered HTML changes so stale files are discarded.
+CACHE_FORMAT = b"1"
+_FORMAT_KEY = b"__format__"
+
+
+def _format_tag(render):
+    # Functions are told apart by qualified name, so two lambdas in the
+    # same scope share a file format.
+    name = f"{getattr(render, '__module__', None)}.{getattr(render, '__qualname__', repr(render))}"
+    return CACHE_FORMAT + b" " + name.encode("utf-8")
+
+
+def render_inline(text):
+    return render_textnodes(text_to_textnodes(text))
+
+
+class RenderCache:
+    def __init__(self, max_entries = 4096, max_bytes = 16 << 20, path = None, render = render_inline,
+                 max_disk_entries = 1 << 16):
+        if max_entries < 1 or max_bytes < 1 or max_disk_entries < 1:
+            raise ValueError("max_entries, max_bytes and max_disk_entries must be positive")
+        self.max_entries = max_entries
+        self.max_bytes = max_bytes
+        self.render_func = render
+        self.path = path
+        self.max_disk_entries = max_disk_entries
+        self._entries = OrderedDict()
+        self._bytes = 0
+        self.hits = 0
+        self.misses = 0
+        self.disk_hits = 0
+        self.evictions = 0
+        self._db = None
+        # Disk keys looked up since the file was opened. A memory hit is
+        # always for a text that missed earlier, so misses cover them all.
+        self._used_keys = set()
+        if path is not None:
+            self._db = dbm.open(path, "c")
+            tag = _format_tag(render)
+            if self._db.get(_FORMAT_KEY) != tag:
+                for key in list(self._db.keys()):
+                    del self._db[key]
+                self._db[_FORMAT_KEY] = tag
+
+    def render(self, text):
+        html = self._entries.get(text)
+        if html is not None:
+            self._entries.move_to_end(text)
+            self.hits += 1
+            return html
+
+        self.misses += 1
+        if self._db is not None:
+            key = hashlib.sha256(text.encode("utf-8")).digest()
+            self._used_keys.add(key)
+            stored = self._db.get(key)
+            if stored is not None:
+                self.disk_hits += 1
+                html = stored.decode("utf-8")
+            else:
+                html = self.render_func(text)
+                self._db[key] = html.encode("utf-8")
+        else:
+            html = self.render_func(text)
+        self._remember(text, html)
+        return html
+
+    def _remember(self, text, html):
+        size = sys.getsizeof(text) + sys.getsizeof(html)
+        if size > self.max_bytes:
+            return
+        self._entries[text] = html
+        self._bytes += size
+        while len(self._entries) > self.max_entries or self._bytes > self.max_bytes:
+            old_text, old_html = self._entries.popitem(last=False)
+            self._bytes -= sys.getsizeof(old_text) + sys.getsizeof(old_html)
+            self.evictions += 1
+
+    def __len__(self):
+        return len(self._entries)
+
+    def stats(self):
+        lookups = self.hits + self.misses
+        return {
+            "entries": len(self._entries),
+            "bytes": self._bytes,
+            "hits": self.hits,
+            "misses": self.misses,
+            "disk_hits": self.disk_hits,
+            "evictions": self.evictions,
+            "hit_rate": self.hits / lookups if lookups else 0.0,
+        }
+
+    def clear(self):
+        """Drop the in-memory tier; the persistent tier is kept."""
+        self._entries.clear()
+        self._bytes = 0
+
+    def prune(self):
+        """Drop persistent snippets not used since the file was opened, if
+        there are more than `max_disk_entries`. Called by close().
+
+        Snippets of pages an incremental build skipped are kept while the
+        file is within the limit."""
+        if self._db is None or len(self._db) - 1 <= self.max_disk_entries:
+            return
+        for key in list(self._db.keys()):
+            if key != _FORMAT_KEY and key not in self._used_keys:
+                del self._db[key]
+
+    def close(self):
+        if self._db is not None:
+            self.prune()
+            self._db.close()
+            self._db = None
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        self.close()
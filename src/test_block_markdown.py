@@ -0,0 +1,173 @@
+import io
+import os
+import tempfile
+import unittest
+
+from block_markdown import (
+    BlockType, iter_blocks, iter_block_nodes, markdown_to_html_node,
+    write_markdown_html, write_markdown_html_bytes, convert_markdown_file, convert_file, iter_mapped_lines,
+)
+
+
+DOCUMENT = """# Title with **bold**
+
+A paragraph with *italic*
+spanning two lines.
+
+- first [link](/a)
+- second
+* third
+
+1. one
+2. `two`
+
+> quoted **text**
+> more quote
+
+```
+code with **stars**
+  indented
+```
+###### Small heading
+"""
+
+
+class TestIterBlocks(unittest.TestCase):
+    def test_block_types(self):
+        blocks = list(iter_blocks(DOCUMENT.splitlines()))
+        self.assertEqual([block_type for block_type, _ in blocks], [
+            BlockType.heading,
+            BlockType.paragraph,
+            BlockType.unordered_list,
+            BlockType.ordered_list,
+            BlockType.quote,
+            BlockType.code,
+            BlockType.heading,
+        ])
+
+    def test_block_lines(self):
+        blocks = list(iter_blocks(DOCUMENT.splitlines()))
+        self.assertEqual(blocks[1][1], ["A paragraph with *italic*", "spanning two lines."])
+        self.assertEqual(blocks[5][1], ["code with **stars**", "  indented"])
+
+    def test_kind_change_starts_new_block(self):
+        blocks = list(iter_blocks(["para", "- item", "# head", "para again"]))
+        self.assertEqual([block_type for block_type, _ in blocks], [
+            BlockType.paragraph, BlockType.unordered_list, BlockType.heading, BlockType.paragraph,
+        ])
+
+    def test_blank_lines_in_code_kept(self):
+        blocks = list(iter_blocks(["```python", "a", "", "b", "```"]))
+        self.assertEqual(blocks, [(BlockType.code, ["a", "", "b"])])
+
+    def test_line_endings_stripped(self):
+        blocks = list(iter_blocks(io.StringIO("one\r\ntwo\r\n\r\nthree\n")))
+        self.assertEqual(blocks, [(BlockType.paragraph, ["one", "two"]), (BlockType.paragraph, ["three"])])
+
+    def test_unclosed_code_block_raises(self):
+        with self.assertRaises(Exception) as ctx:
+            list(iter_blocks(["```", "never closed"]))
+        self.assertIn("Unclosed code block", str(ctx.exception))
+
+    def test_yields_blocks_lazily(self):
+        def lines():
+            yield "first paragraph"
+            yield ""
+            raise AssertionError("read past the first block")
+        self.assertEqual(next(iter_blocks(lines())), (BlockType.paragraph, ["first paragraph"]))
+
+
+class TestBlockNodes(unittest.TestCase):
+    def test_document_html(self):
+        html = markdown_to_html_node(DOCUMENT).to_html()
+        self.assertEqual(html, "".join([
+            "<div>",
+            "<h1>Title with <b>bold</b></h1>",
+            "<p>A paragraph with <i>italic</i>\nspanning two lines.</p>",
+            '<ul><li>first <a href="/a">link</a></li><li>second</li><li>third</li></ul>',
+            "<ol><li>one</li><li><code>two</code></li></ol>",
+            "<blockquote>quoted <b>text</b>\nmore quote</blockquote>",
+            "<pre><code>code with **stars**\n  indented\n</code></pre>",
+            "<h6>Small heading</h6>",
+            "</div>",
+        ]))
+
+    def test_only_newline_ends_a_line(self):
+        html = markdown_to_html_node("one\u2028two\x0cthree\x1c\x85\n\n# four\x0b").to_html()
+        self.assertEqual(html, "<div><p>one\u2028two\x0cthree\x1c\x85</p><h1>four\x0b</h1></div>")
+
+    def test_empty_document(self):
+        self.assertEqual(markdown_to_html_node("").to_html(), "<div></div>")
+        self.assertEqual(list(iter_block_nodes(["", "   "])), [])
+
+    def test_write_matches_tree(self):
+        buffer = io.StringIO()
+        write_markdown_html(io.StringIO(DOCUMENT), buffer)
+        self.assertEqual(buffer.getvalue(), markdown_to_html_node(DOCUMENT).to_html())
+
+    def test_write_bytes_matches_tree(self):
+        document = DOCUMENT + "\nnon-ASCII: é 🚀\n"
+        expected = markdown_to_html_node(document).to_html().encode()
+        for buffer in (io.BytesIO(), bytearray()):
+            with self.subTest(buffer=type(buffer).__name__):
+                write_markdown_html_bytes(io.StringIO(document), buffer)
+                self.assertEqual(bytes(buffer.getbuffer() if isinstance(buffer, io.BytesIO) else buffer), expected)
+
+    def test_convert_file(self):
+        with tempfile.TemporaryDirectory() as tmp:
+            source = os.path.join(tmp, "page.md")
+            target = os.path.join(tmp, "page.html")
+            with open(source, "w", encoding="utf-8") as f:
+                f.write(DOCUMENT)
+            convert_markdown_file(source, target)
+            with open(target, encoding="utf-8") as f:
+                self.assertEqual(f.read(), markdown_to_html_node(DOCUMENT).to_html())
+
+
+class TestConvertFile(unittest.TestCase):
+    def setUp(self):
+        self.tmp = tempfile.TemporaryDirectory()
+        self.path = os.path.join(self.tmp.name, "page.md")
+
+    def tearDown(self):
+        self.tmp.cleanup()
+
+    def write_source(self, data):
+        with open(self.path, "wb") as f:
+            f.write(data)
+
+    def test_mmap_matches_regular_read(self):
+        self.write_source(DOCUMENT.encode("utf-8"))
+        expected = markdown_to_html_node(DOCUMENT).to_html()
+        self.assertEqual(convert_file(self.path, mmap=True), expected)
+        self.assertEqual(convert_file(self.path, mmap=False), expected)
+
+    def test_mmap_matches_regular_read_for_cr_line_endings(self):
+        for data in (b"# Title\r- item\rpara\n", b"# Title\r\n- item\r\n\r\npara\r", b"a\r\rb\r\n\r\nc"):
+            with self.subTest(data=data):
+                self.write_source(data)
+                regular = convert_file(self.path, mmap=False)
+                self.assertEqual(convert_file(self.path, mmap=True), regular)
+                with open(self.path, encoding="utf-8") as f:
+                    self.assertEqual(list(iter_mapped_lines(self.path)), list(f))
+        self.write_source(b"# Title\r- item\rpara\n")
+        self.assertEqual(convert_file(self.path, mmap=True), "<div><h1>Title</h1><ul><li>item</li></ul><p>para</p></div>")
+
+    def test_streams_into_fp(self):
+        self.write_source(DOCUMENT.encode("utf-8"))
+        buffer = io.StringIO()
+        self.assertIsNone(convert_file(self.path, fp=buffer))
+        self.assertEqual(buffer.getvalue(), markdown_to_html_node(DOCUMENT).to_html())
+
+    def test_empty_file(self):
+        self.write_source(b"")
+        self.assertEqual(convert_file(self.path), "<div></div>")
+
+    def test_mapped_lines_decode_utf8(self):
+        self.write_source("caf\u00e9 **\U0001f680**\r\nno newline at end".encode("utf-8"))
+        self.assertEqual(list(iter_mapped_lines(self.path)), ["caf\u00e9 **\U0001f680**\n", "no newline at end"])
+        self.assertEqual(convert_file(self.path), "<div><p>caf\u00e9 <b>\U0001f680</b>\nno newline at end</p></div>")
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,204 @@
+import asyncio
+import json
+import os
+import tempfile
+import unittest
+from unittest import mock
+
+import build as build_module
+from build import MANIFEST_NAME, build, build_async, markdown_to_html
+from render_cache import RenderCache
+
+
+def write(path, text):
+    os.makedirs(os.path.dirname(path), exist_ok=True)
+    with open(path, "w", encoding="utf-8") as f:
+        f.write(text)
+
+
+def read(path):
+    with open(path, encoding="utf-8") as f:
+        return f.read()
+
+
+def read_bytes(path):
+    with open(path, "rb") as f:
+        return f.read()
+
+
+class TestMarkdownToHtml(unittest.TestCase):
+    def test_paragraphs(self):
+        html = markdown_to_html("Hello **world**\n\nSee [docs](/docs) and `code`\n")
+        self.assertEqual(
+            html,
+            '<div><p>Hello <b>world</b></p><p>See <a href="/docs">docs</a> and <code>code</code></p></div>',
+        )
+
+    def test_blank_blocks_skipped(self):
+        self.assertEqual(markdown_to_html("\n\n\n\none\n\n\n\n"), "<div><p>one</p></div>")
+
+
+class TestBuild(unittest.TestCase):
+    def setUp(self):
+        self.tmp = tempfile.TemporaryDirectory()
+        self.content = os.path.join(self.tmp.name, "content")
+        self.output = os.path.join(self.tmp.name, "public")
+        write(os.path.join(self.content, "index.md"), "Hello *there*")
+        write(os.path.join(self.content, "blog", "post.md"), "A **post**")
+
+    def tearDown(self):
+        self.tmp.cleanup()
+
+    def test_first_build_converts_everything(self):
+        report = build(self.content, self.output)
+        self.assertEqual(report["built"], [os.path.join("blog", "post.md"), "index.md"])
+        self.assertEqual(read(os.path.join(self.output, "index.html")), "<div><p>Hello <i>there</i></p></div>")
+        self.assertEqual(read(os.path.join(self.output, "blog", "post.html")), "<div><p>A <b>post</b></p></div>")
+
+    def test_unchanged_files_skipped(self):
+        build(self.content, self.output)
+        report = build(self.content, self.output)
+        self.assertEqual(report["built"], [])
+        self.assertEqual(len(report["skipped"]), 2)
+
+    def test_changed_file_rebuilt(self):
+        build(self.content, self.output)
+        write(os.path.join(self.content, "index.md"), "Goodbye `now`")
+        report = build(self.content, self.output)
+        self.assertEqual(report["built"], ["index.md"])
+        self.assertEqual(read(os.path.join(self.output, "index.html")), "<div><p>Goodbye <code>now</code></p></div>")
+
+    def test_touched_but_identical_file_skipped(self):
+        build(self.content, self.output)
+        path = os.path.join(self.content, "index.md")
+        st = os.stat(path)
+        os.utime(path, ns=(st.st_atime_ns, st.st_mtime_ns + 10**9))
+        report = build(self.content, self.output)
+        self.assertEqual(report["built"], [])
+        with open(os.path.join(self.output, MANIFEST_NAME), encoding="utf-8") as f:
+            manifest = json.load(f)
+        self.assertEqual(manifest["files"]["index.md"]["mtime_ns"], st.st_mtime_ns + 10**9)
+
+    def test_missing_output_rebuilt(self):
+        build(self.content, self.output)
+        os.remove(os.path.join(self.output, "index.html"))
+        report = build(self.content, self.output)
+        self.assertEqual(report["built"], ["index.md"])
+
+    def test_deleted_source_removes_output(self):
+        build(self.content, self.output)
+        os.remove(os.path.join(self.content, "blog", "post.md"))
+        report = build(self.content, self.output)
+        self.assertEqual(report["removed"], [os.path.join("blog", "post.md")])
+        self.assertFalse(os.path.exists(os.path.join(self.output, "blog", "post.html")))
+
+    def test_force_rebuilds_everything(self):
+        build(self.content, self.output)
+        report = build(self.content, self.output, force=True)
+        self.assertEqual(len(report["built"]), 2)
+
+    def test_parallel_build_matches_serial(self):
+        for i in range(12):
+            write(os.path.join(self.content, "many", f"page{i}.md"), f"Page **{i}**\n\nwith [link](/p/{i})")
+        serial = os.path.join(self.tmp.name, "serial")
+        serial_report = build(self.content, serial, jobs=1)
+        parallel_report = build(self.content, self.output, jobs=3)
+        self.assertEqual(parallel_report["built"], serial_report["built"])
+        for source in serial_report["built"]:
+            html = os.path.splitext(source)[0] + ".html"
+            self.assertEqual(read(os.path.join(self.output, html)), read(os.path.join(serial, html)))
+
+    def test_build_with_inline_cache(self):
+        cached_output = os.path.join(self.tmp.name, "cached")
+        build(self.content, self.output)
+        build(self.content, cached_output, cache=RenderCache())
+        self.assertEqual(read(os.path.join(cached_output, "index.html")), read(os.path.join(self.output, "index.html")))
+        with self.assertRaises(ValueError):
+            build(self.content, cached_output, force=True, jobs=2, cache=RenderCache())
+
+    def test_missing_content_dir_keeps_output(self):
+        build(self.content, self.output)
+        before = sorted(os.listdir(self.output))
+        missing = os.path.join(self.tmp.name, "contnet")
+        with self.assertRaises(NotADirectoryError):
+            build(missing, self.output)
+        with self.assertRaises(NotADirectoryError):
+            asyncio.run(build_async(missing, self.output))
+        with self.assertRaises(NotADirectoryError):
+            build(os.path.join(self.content, "index.md"), self.output)
+        self.assertEqual(sorted(os.listdir(self.output)), before)
+
+    def test_corrupt_manifest_triggers_full_build(self):
+        build(self.content, self.output)
+        write(os.path.join(self.output, MANIFEST_NAME), "not json")
+        report = build(self.content, self.output)
+        self.assertEqual(len(report["built"]), 2)
+
+
+class TestBuildAsync(unittest.TestCase):
+    def setUp(self):
+        self.tmp = tempfile.TemporaryDirectory()
+        self.content = os.path.join(self.tmp.name, "content")
+        self.output = os.path.join(self.tmp.name, "public")
+        for i in range(12):
+            write(os.path.join(self.content, "many", f"page{i}.md"), f"Page **{i}**\n\nwith [link](/p/{i})")
+        write(os.path.join(self.content, "index.md"), "Hello *there*")
+
+    def tearDown(self):
+        self.tmp.cleanup()
+
+    def assert_matches_serial(self, **kwargs):
+        serial = os.path.join(self.tmp.name, "serial")
+        serial_report = build(self.content, serial)
+        report = asyncio.run(build_async(self.content, self.output, **kwargs))
+        self.assertEqual(report, serial_report)
+        for source in report["built"]:
+            html = os.path.splitext(source)[0] + ".html"
+            self.assertEqual(read_bytes(os.path.join(self.output, html)), read_bytes(os.path.join(serial, html)))
+
+    def test_matches_serial_build(self):
+        self.assert_matches_serial()
+
+    def test_matches_serial_build_with_line_separators(self):
+        # Only "\n" (and "\r\n" via universal newlines) ends a line.
+        write(os.path.join(self.content, "separators.md"), "line one\u2028line two\r\n\nform\x0cfeed\x1cand \x85é\n")
+        self.assert_matches_serial()
+        self.assert_matches_serial(jobs=2)
+        self.assertEqual(read(os.path.join(self.output, "separators.html")),
+                         "<div><p>line one\u2028line two</p><p>form\x0cfeed\x1cand \x85é</p></div>")
+
+    def test_large_sources_streamed(self):
+        write(os.path.join(self.content, "big", "changelog.md"), "# Changes\n\n" + "- fixed *thing*\n" * 2000)
+        with mock.patch.object(build_module, "STREAM_THRESHOLD", 1024), \
+                mock.patch.object(build_module, "_markdown_to_html_bytes", wraps=build_module._markdown_to_html_bytes) as in_memory:
+            self.assert_matches_serial(queue_size=1)
+        # Only the 13 small pages went through the queues.
+        self.assertEqual(in_memory.call_count, 13)
+
+    def test_matches_serial_build_with_workers_and_small_queues(self):
+        self.assert_matches_serial(jobs=2, queue_size=1)
+
+    def test_incremental_rebuild(self):
+        asyncio.run(build_async(self.content, self.output))
+        write(os.path.join(self.content, "index.md"), "Goodbye `now`")
+        report = asyncio.run(build_async(self.content, self.output))
+        self.assertEqual(report["built"], ["index.md"])
+        self.assertEqual(len(report["skipped"]), 12)
+        self.assertEqual(read(os.path.join(self.output, "index.html")), "<div><p>Goodbye <code>now</code></p></div>")
+
+    def test_inline_cache(self):
+        cache = RenderCache()
+        self.assert_matches_serial(cache=cache)
+        self.assertEqual(cache.stats()["misses"], 25)
+        with self.assertRaises(ValueError):
+            asyncio.run(build_async(self.content, self.output, force=True, jobs=2, cache=RenderCache()))
+
+    def test_conversion_error_raised(self):
+        write(os.path.join(self.content, "broken.md"), "```\nnever closed")
+        with self.assertRaisesRegex(Exception, "Unclosed code block"):
+            asyncio.run(build_async(self.content, self.output, queue_size=1))
+        self.assertFalse(os.path.exists(os.path.join(self.output, MANIFEST_NAME)))
+
+
+if __name__ == "__main__":
+    unittest.main()
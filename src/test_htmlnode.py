@@ -1,7 +1,12 @@
+import copy
+import io
+import pickle
 import unittest
 from collections import OrderedDict
+from unittest import mock
 
-from textnode import TextNode, TextType, text_node_to_html_node
+from textnode import TextNode, TextType, text_node_to_html_node, text_node_to_html
+import htmlnode
 from htmlnode import HtmlNode, LeafNode, ParentNode
 
 
@@ -27,6 +32,10 @@ class TestHtmlNode(unittest.TestCase):
         expected = "HtmlNode(tag=p, value=Hello, children=[], props={'style': 'color:red;'})"
         self.assertEqual(repr(node), expected)
 
+    def test_slots_no_instance_dict(self):
+        for node in (HtmlNode("div"), LeafNode("b", "x"), ParentNode("p", [])):
+            self.assertFalse(hasattr(node, "__dict__"))
+
     def test_leaf_to_html_p(self):
         node = LeafNode("p", "Hello, world!")
         self.assertEqual(node.to_html(), "<p>Hello, world!</p>")
@@ -64,12 +73,342 @@ class TestHtmlNode(unittest.TestCase):
             "<div><span><b>grandchild</b></span></div>",
         )
 
+    def test_iter_html_chunks(self):
+        parent_node = ParentNode("div", [LeafNode("b", "bold"), LeafNode(None, " text")], {"class": "x"})
+        chunks = list(parent_node.iter_html())
+        self.assertEqual(chunks, ['<div class="x">', "<b>bold</b> text", "</div>"])
+        self.assertEqual("".join(chunks), parent_node.to_html())
+
+    def test_write_html(self):
+        grandchild_node = LeafNode("b", "grandchild")
+        parent_node = ParentNode("div", [ParentNode("span", [grandchild_node]), LeafNode(None, "tail")])
+        buffer = io.StringIO()
+        parent_node.write_html(buffer)
+        self.assertEqual(buffer.getvalue(), parent_node.to_html())
+        self.assertEqual(buffer.getvalue(), "<div><span><b>grandchild</b></span>tail</div>")
+
+    def test_deep_nesting_does_not_recurse(self):
+        depth = 50_000
+        node = LeafNode("b", "leaf")
+        for _ in range(depth):
+            node = ParentNode("div", [node])
+        html = node.to_html()
+        self.assertTrue(html.startswith("<div>" * depth + "<b>leaf</b>"))
+        self.assertTrue(html.endswith("</div>" * depth))
+
+    def test_siblings_after_nested_parent(self):
+        node = ParentNode("ul", [
+            ParentNode("li", [LeafNode("b", "one")]),
+            LeafNode(None, " "),
+            ParentNode("li", [ParentNode("i", [LeafNode(None, "two")])]),
+        ])
+        self.assertEqual(node.to_html(), "<ul><li><b>one</b></li> <li><i>two</i></li></ul>")
+
+    def test_nested_parent_missing_children_raises(self):
+        with self.assertRaises(ValueError):
+            ParentNode("div", [ParentNode("span", None)]).to_html()
+
+    def test_parent_empty_children(self):
+        self.assertEqual(ParentNode("div", []).to_html(), "<div></div>")
+
+    def test_parent_missing_tag_raises(self):
+        with self.assertRaises(ValueError):
+            ParentNode(None, [LeafNode("b", "x")]).to_html()
+        with self.assertRaises(ValueError):
+            ParentNode("div", None).to_html()
+
+    def test_base_to_html_not_implemented(self):
+        with self.assertRaises(NotImplementedError):
+            HtmlNode("div").to_html()
+
+    def test_subclass_overriding_only_to_html(self):
+        class Raw(HtmlNode):
+            __slots__ = ()
+            def to_html(self):
+                return "<hr>"
+        page = ParentNode("div", [LeafNode("b", "x"), ParentNode("p", [Raw()]), Raw()])
+        self.assertEqual(page.to_html(), "<div><b>x</b><p><hr></p><hr></div>")
+        buffer = io.StringIO()
+        page.write_html(buffer)
+        self.assertEqual(buffer.getvalue(), page.to_html())
+        self.assertEqual(page.to_html_bytes(), page.to_html().encode())
+        with self.assertRaises(NotImplementedError):
+            ParentNode("div", [HtmlNode("hr")]).to_html()
+
     def test_text(self):
         node = TextNode("This is a text node", TextType.plaintext)
         html_node = text_node_to_html_node(node)
         self.assertEqual(html_node.tag, None)
         self.assertEqual(html_node.value, "This is a text node")
 
+class TestHtmlBytes(unittest.TestCase):
+    def tree(self):
+        return ParentNode("div", [
+            ParentNode("p", [LeafNode(None, "café "), LeafNode("b", "🚀"), LeafNode(None, "")]),
+            ParentNode("ul", [ParentNode("li", [LeafNode("a", "ñ", {"href": "/é"})])], {"class": "x"}),
+            LeafNode("img", "", {"src": "a.png", "alt": "ü"}),
+            ParentNode(1, [LeafNode(True, 1)]),
+        ])
+
+    def test_matches_encoded_str(self):
+        tree = self.tree()
+        expected = tree.to_html().encode()
+        self.assertEqual(tree.to_html_bytes(), expected)
+        self.assertEqual(tree.to_html_bytes(), expected)
+        self.assertEqual(LeafNode("b", "é").to_html_bytes(), "<b>é</b>".encode())
+        self.assertIsInstance(tree.to_html_bytes(), bytes)
+
+    def test_write_to_bytearray_and_binary_file(self):
+        tree = self.tree()
+        buffer = bytearray(b"<!doctype html>")
+        tree.write_html_bytes(buffer)
+        self.assertEqual(bytes(buffer), b"<!doctype html>" + tree.to_html().encode())
+        stream = io.BytesIO()
+        writer = io.BufferedWriter(stream)
+        tree.write_html_bytes(writer)
+        writer.flush()
+        self.assertEqual(stream.getvalue(), tree.to_html().encode())
+
+    def test_errors_match_str_renderer(self):
+        for node in (ParentNode(None, [LeafNode("b", "x")]), ParentNode("p", None),
+                     ParentNode("div", [LeafNode("b", None)])):
+            with self.subTest(node=node):
+                with self.assertRaises(ValueError):
+                    node.to_html_bytes()
+
+    def test_deep_tree(self):
+        node = LeafNode("b", "leaf")
+        for _ in range(10_000):
+            node = ParentNode("div", [node])
+        self.assertEqual(node.to_html_bytes(), node.to_html().encode())
+
+    def test_frozen_subtree_spliced_as_bytes(self):
+        nav = ParentNode("nav", [LeafNode("a", "Accueil é", {"href": "/"})]).freeze()
+        page = ParentNode("body", [nav, LeafNode("p", "x")])
+        with mock.patch.object(ParentNode, "_open_tag", autospec=True, side_effect=ParentNode._open_tag) as open_tag:
+            self.assertEqual(page.to_html_bytes(), page.to_html().encode())
+        self.assertEqual(open_tag.call_count, 2)
+        self.assertEqual(nav.to_html_bytes(), nav.to_html().encode())
+        nav.children[0].value = "Home"
+        self.assertIn(b">Home</a>", page.to_html_bytes())
+        leaf = LeafNode("b", "ß").freeze()
+        self.assertEqual(leaf.to_html_bytes(), "<b>ß</b>".encode())
+
+
+class TestFreeze(unittest.TestCase):
+    def setUp(self):
+        self.nav = ParentNode("nav", [
+            LeafNode("a", "Home", {"href": "/"}),
+            ParentNode("ul", [LeafNode("li", "one")]),
+        ])
+        self.nav_html = '<nav><a href="/">Home</a><ul><li>one</li></ul></nav>'
+
+    def page(self, nav, body):
+        return ParentNode("div", [nav, LeafNode("p", body)])
+
+    def test_freeze_returns_frozen_copy(self):
+        frozen = self.nav.freeze()
+        self.assertIsNot(frozen, self.nav)
+        self.assertTrue(frozen.frozen)
+        self.assertEqual(frozen.to_html(), self.nav_html)
+        self.assertIsInstance(frozen, ParentNode)
+        self.assertIsInstance(frozen.children[0], LeafNode)
+        self.assertFalse(self.nav.frozen)
+        self.assertIs(type(self.nav), ParentNode)
+        self.assertFalse(frozen.children[0].frozen)
+
+    def test_original_tree_untouched(self):
+        children = self.nav.children
+        props = self.nav.children[0].props
+        frozen = self.nav.freeze()
+        self.assertIs(self.nav.children, children)
+        self.assertIs(self.nav.children[0].props, props)
+        children.append(LeafNode("b", "new"))
+        props["class"] = "home"
+        self.assertIn("<b>new</b>", self.nav.to_html())
+        self.assertIn('class="home"', self.nav.to_html())
+        self.assertTrue(frozen.frozen)
+        self.assertEqual(frozen.to_html(), self.nav_html)
+
+    def test_frozen_subtree_spliced_into_pages(self):
+        frozen = self.nav.freeze()
+        with mock.patch.object(ParentNode, "_open_tag", autospec=True, side_effect=ParentNode._open_tag) as open_tag:
+            pages = [self.page(frozen, f"page {i}").to_html() for i in range(3)]
+        self.assertEqual(pages[2], f"<div>{self.nav_html}<p>page 2</p></div>")
+        # Only each page's own div is opened; the nav is never walked.
+        self.assertEqual(open_tag.call_count, 3)
+        buffer = io.StringIO()
+        self.page(frozen, "x").write_html(buffer)
+        self.assertEqual(buffer.getvalue(), f"<div>{self.nav_html}<p>x</p></div>")
+
+    def test_mutations_drop_cache(self):
+        mutations = [
+            lambda nav: setattr(nav, "tag", "header"),
+            lambda nav: nav.children.append(LeafNode(None, "!")),
+            lambda nav: nav.children.pop(),
+            lambda nav: nav.children[1].children.insert(0, LeafNode("li", "zero")),
+            lambda nav: setattr(nav.children[0], "value", "Start"),
+            lambda nav: nav.children[0].props.update({"class": "home"}),
+            lambda nav: nav.children[0].props.__delitem__("href"),
+            lambda nav: nav.children.__setitem__(0, LeafNode("a", "Other")),
+        ]
+        for mutate in mutations:
+            with self.subTest(mutate=mutate):
+                frozen = self.nav.freeze()
+                page = self.page(frozen, "x")
+                mutate(frozen)
+                self.assertFalse(frozen.frozen)
+                self.assertNotIn(self.nav_html, page.to_html())
+                self.assertEqual(self.nav.to_html(), self.nav_html)
+
+    def test_freeze_tree_containing_frozen_copy(self):
+        nav = self.nav.freeze()
+        page = self.page(nav, "body").freeze()
+        self.assertEqual(page.to_html(), f"<div>{self.nav_html}<p>body</p></div>")
+        self.assertIsNot(page.children[0], nav)
+        nav.children[1].children[0].value = "uno"
+        self.assertTrue(page.frozen)
+        page.children[0].children[1].children[0].value = "uno"
+        self.assertFalse(page.frozen)
+        self.assertIn("<li>uno</li>", page.to_html())
+
+    def test_shared_node_stays_shared(self):
+        shared = LeafNode("b", "shared")
+        frozen = ParentNode("p", [shared, LeafNode(None, "!"), shared]).freeze()
+        self.assertIs(frozen.children[0], frozen.children[2])
+        frozen.children[0].value = "changed"
+        self.assertFalse(frozen.frozen)
+        self.assertEqual(frozen.to_html(), "<p><b>changed</b>!<b>changed</b></p>")
+        self.assertEqual(shared.value, "shared")
+
+    def test_thaw_and_refreeze(self):
+        frozen = self.nav.freeze()
+        frozen.children[1].thaw()
+        self.assertTrue(frozen.frozen)
+        frozen.thaw()
+        self.assertFalse(frozen.frozen)
+        self.assertEqual(frozen.to_html(), self.nav_html)
+        again = frozen.freeze()
+        self.assertTrue(again.frozen)
+        self.assertEqual(again.to_html(), self.nav_html)
+        LeafNode("b", "x").thaw()
+
+    def test_frozen_leaf(self):
+        leaf = LeafNode("b", "x").freeze()
+        self.assertTrue(leaf.frozen)
+        self.assertEqual(ParentNode("p", [leaf]).to_html(), "<p><b>x</b></p>")
+        leaf.value = "y"
+        self.assertFalse(leaf.frozen)
+        self.assertEqual(leaf.to_html(), "<b>y</b>")
+
+    def test_copy_and_pickle_give_plain_nodes(self):
+        frozen = self.page(self.nav, "body").freeze()
+        for name, clone in [
+            ("copy", copy.copy),
+            ("deepcopy", copy.deepcopy),
+            ("pickle", lambda node: pickle.loads(pickle.dumps(node))),
+        ]:
+            with self.subTest(name):
+                node = clone(frozen)
+                self.assertIs(type(node), ParentNode)
+                self.assertFalse(node.frozen)
+                self.assertEqual(node.to_html(), frozen.to_html())
+                if name != "copy":
+                    self.assertIs(type(node.children), list)
+                    self.assertIs(type(node.children[0]), ParentNode)
+                    self.assertIs(type(node.children[0].children[0].props), dict)
+                    node.children.append(LeafNode(None, "!"))
+                    self.assertTrue(frozen.frozen)
+        self.assertIs(type(copy.copy(frozen.children)), list)
+        # Restoring state attribute by attribute must not need `_frozen`.
+        bare = object.__new__(type(frozen))
+        bare.tag = "div"
+        self.assertEqual(bare.tag, "div")
+        # Only frozen copies carry the extra slot.
+        for cls in (HtmlNode, LeafNode, ParentNode):
+            self.assertNotIn("_frozen", cls.__slots__)
+        self.assertFalse(hasattr(LeafNode("p", "x"), "_frozen"))
+        self.assertEqual(pickle.loads(pickle.dumps(frozen.children[0].children[0].props)), {"href": "/"})
+
+    def test_invalid_subtree_not_frozen(self):
+        node = ParentNode("div", [LeafNode("b", None)])
+        with self.assertRaises(ValueError):
+            node.freeze()
+        self.assertIs(type(node), ParentNode)
+
+    def test_unknown_node_class_rejected(self):
+        class Custom(LeafNode):
+            __slots__ = ()
+        node = ParentNode("div", [Custom("b", "x")])
+        with self.assertRaises(TypeError):
+            node.freeze()
+        self.assertIs(type(node), ParentNode)
+
+
+class TestPropsCache(unittest.TestCase):
+    def setUp(self):
+        htmlnode.clear_props_cache()
+
+    def test_repeated_props_reuse_cached_string(self):
+        first = LeafNode("a", "x", {"href": "/home", "class": "nav"})
+        second = LeafNode("a", "y", {"href": "/home", "class": "nav"})
+        self.assertIs(first.props_to_html(), second.props_to_html())
+
+    def test_in_place_mutation_invalidates(self):
+        node = LeafNode("a", "x", {"href": "/home"})
+        self.assertEqual(node.to_html(), '<a href="/home">x</a>')
+        node.props["href"] = "/about"
+        self.assertEqual(node.to_html(), '<a href="/about">x</a>')
+        node.props["class"] = "nav"
+        self.assertEqual(node.to_html(), '<a href="/about" class="nav">x</a>')
+        del node.props["href"]
+        self.assertEqual(node.to_html(), '<a class="nav">x</a>')
+        node.props.clear()
+        self.assertEqual(node.to_html(), "<a>x</a>")
+
+    def test_reassigned_props_invalidates(self):
+        node = ParentNode("div", [LeafNode(None, "x")], {"class": "a"})
+        self.assertEqual(node.to_html(), '<div class="a">x</div>')
+        node.props = {"class": "b"}
+        self.assertEqual(node.to_html(), '<div class="b">x</div>')
+        node.props = None
+        self.assertEqual(node.to_html(), "<div>x</div>")
+
+    def test_equal_values_of_different_types(self):
+        self.assertEqual(HtmlNode("td", props={"colspan": 1}).props_to_html(), ' colspan="1"')
+        self.assertEqual(HtmlNode("td", props={"colspan": True}).props_to_html(), ' colspan="True"')
+        self.assertEqual(HtmlNode("td", props={"colspan": 1.0}).props_to_html(), ' colspan="1.0"')
+        self.assertEqual(HtmlNode("td", props={"colspan": 1, "rowspan": 2}).props_to_html(), ' colspan="1" rowspan="2"')
+        self.assertEqual(HtmlNode("td", props={"colspan": True, "rowspan": 2}).props_to_html(), ' colspan="True" rowspan="2"')
+
+    def test_unhashable_values(self):
+        node = HtmlNode("div", props={"data-x": ["a", "b"]})
+        self.assertEqual(node.props_to_html(), " data-x=\"['a', 'b']\"")
+        node = HtmlNode("div", props={"id": "a", "data-x": ["a", "b"]})
+        self.assertEqual(node.props_to_html(), " id=\"a\" data-x=\"['a', 'b']\"")
+
+    def test_cache_is_bounded(self):
+        for i in range(htmlnode._PROPS_CACHE_SIZE + 10):
+            HtmlNode("div", props={"id": f"n{i}", "class": "x"}).props_to_html()
+        self.assertEqual(len(htmlnode._props_cache), htmlnode._PROPS_CACHE_SIZE)
+        self.assertEqual(HtmlNode("div", props={"id": "n0", "class": "x"}).props_to_html(), ' id="n0" class="x"')
+
+    def test_least_recently_used_evicted_first(self):
+        hot = HtmlNode("a", props={"class": "hot", "rel": "nofollow"})
+        first_cold = (("id", "n0"), ("class", "cold"))
+        for i in range(htmlnode._PROPS_CACHE_SIZE + 10):
+            hot.props_to_html()
+            HtmlNode("div", props={"id": f"n{i}", "class": "cold"}).props_to_html()
+        self.assertIn((("class", "hot"), ("rel", "nofollow")), htmlnode._props_cache)
+        self.assertNotIn(first_cold, htmlnode._props_cache)
+        self.assertEqual(list(htmlnode._props_cache)[-1], (("id", f"n{htmlnode._PROPS_CACHE_SIZE + 9}"), ("class", "cold")))
+
+    def test_single_attribute_not_cached(self):
+        node = LeafNode("a", "x", {"href": "/home"})
+        self.assertEqual(node.props_to_html(), ' href="/home"')
+        self.assertEqual(htmlnode._props_cache, {})
+
+
 class TestTextNodeToHtmlNode(unittest.TestCase):
     
     def test_plaintext_to_html(self):
@@ -180,6 +519,46 @@ class TestTextNodeToHtmlNode(unittest.TestCase):
             html_node = text_node_to_html_node(text_node)
             self.assertIsInstance(html_node, LeafNode)
 
+
+
+class TestTextNodeToHtml(unittest.TestCase):
+    def test_matches_leaf_rendering(self):
+        nodes = [
+            TextNode("Plain & <raw>", TextType.plaintext),
+            TextNode("", TextType.plaintext),
+            TextNode("Bold", TextType.bold),
+            TextNode("Italic", TextType.italic),
+            TextNode("print('x')", TextType.codetext),
+            TextNode("Click", TextType.link, "https://example.com/?a=1&b=2"),
+            TextNode("Click", TextType.link, None),
+            TextNode("Click", TextType.link, ""),
+            TextNode("Alt text", TextType.image, "img.png"),
+            TextNode("Alt text", TextType.image, None),
+            TextNode(None, TextType.image, "img.png"),
+            TextNode(42, TextType.bold),
+        ]
+        for node in nodes:
+            with self.subTest(node=node):
+                self.assertEqual(text_node_to_html(node), text_node_to_html_node(node).to_html())
+
+    def test_missing_text_raises_like_leaf(self):
+        for text_type in (TextType.plaintext, TextType.bold, TextType.link):
+            with self.subTest(text_type=text_type):
+                with self.assertRaises(ValueError):
+                    text_node_to_html(TextNode(None, text_type, "url"))
+
+    def test_invalid_text_type_raises(self):
+        with self.assertRaises(Exception) as context:
+            text_node_to_html(TextNode("Some text", "invalid_type"))
+        self.assertIn("Unsupported TextType", str(context.exception))
+        with self.assertRaises(Exception) as context:
+            text_node_to_html(TextNode("Some text", None))
+        self.assertEqual(str(context.exception), "TextNode must have a text_type")
+
+    def test_unhashable_text_type_raises(self):
+        with self.assertRaises(Exception) as context:
+            text_node_to_html_node(TextNode("Some text", ["bold"]))
+        self.assertIn("Unsupported TextType", str(context.exception))
     
 
 if __name__ == "__main__":
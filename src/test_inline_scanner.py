@@ -0,0 +1,142 @@
+import unittest
+from textnode import TextNode, TextSpan, TextType
+from markdown_to_text import text_to_textnodes
+from inline_scanner import tokenize_inline
+
+
+# Inputs taken from the text_to_textnodes tests, plus a few edge cases.
+CORPUS = [
+    "Just plain text without any formatting",
+    "This is **bold text** in a sentence",
+    "This is *italic text* in a sentence",
+    "This is `code text` in a sentence",
+    "This is an ![image](https://example.com/img.jpg) in text",
+    "This is a [link](https://example.com) in text",
+    "**First bold** and **second bold**",
+    "*First italic* and *second italic*",
+    "**Bold** and *italic* in same sentence",
+    "**Bold***Italic*",
+    "![image](img.jpg) and [link](page.html)",
+    "Text with `code` and **bold**",
+    "This is **bold**, *italic*, `code`, ![image](img.jpg), and [link](url)",
+    "",
+    "**bold**",
+    "**bold** at start",
+    "text at end **bold**",
+    "**bold****more bold**",
+    "This is [a link](page.html) not ![an image](img.jpg)",
+    "This is ![an image](img.jpg) not [a link](page.html)",
+    "Text with & special <chars> **bold**",
+    "Text with 🚀 **rocket** and 😊 **smile**",
+    "This is `**not bold**` and `![not image]`",
+    "`**code with stars**` and **actual bold**",
+    "`[not a link]` and [actual link](url)",
+    "**bold**text",
+    "text**bold**",
+    "[**bold link**](url)",
+    "``",
+    "****",
+    "a***b**",
+    "![a](b)[c](d)",
+    "!![a](b)",
+    "![x](u[a](b)",
+    "[x](y)`c`*i*",
+    "line one\n**line two**\n[link](url)",
+]
+
+ERROR_CORPUS = [
+    "This has `no close",
+    "**",
+    "**unclosed bold",
+    "*unclosed italic",
+    "*italic first* then **bold",
+    "*stray then `unclosed code",
+    "`ok` *a [l](u) **b",
+]
+
+
+class TestTokenizeInlineParity(unittest.TestCase):
+    def test_matches_reference(self):
+        for text in CORPUS:
+            with self.subTest(text=text):
+                self.assertEqual(tokenize_inline(text), text_to_textnodes(text))
+
+    def test_spans_match_reference(self):
+        for text in CORPUS:
+            with self.subTest(text=text):
+                nodes = tokenize_inline(text, spans=True)
+                self.assertEqual(nodes, text_to_textnodes(text))
+                for node in nodes:
+                    self.assertIsInstance(node, TextSpan)
+                    self.assertIs(node.source, text)
+
+    def test_errors_match_reference(self):
+        for text in ERROR_CORPUS:
+            with self.subTest(text=text):
+                with self.assertRaises(Exception) as expected:
+                    text_to_textnodes(text)
+                with self.assertRaises(Exception) as actual:
+                    tokenize_inline(text)
+                self.assertEqual(str(actual.exception), str(expected.exception))
+
+    def test_complex_combination(self):
+        nodes = tokenize_inline("**bold** `code` ![img](a.png) [link](b.html) *it*")
+        expected = [
+            TextNode("bold", TextType.bold),
+            TextNode(" ", TextType.plaintext),
+            TextNode("code", TextType.codetext),
+            TextNode(" ", TextType.plaintext),
+            TextNode("img", TextType.image, "a.png"),
+            TextNode(" ", TextType.plaintext),
+            TextNode("link", TextType.link, "b.html"),
+            TextNode(" ", TextType.plaintext),
+            TextNode("it", TextType.italic),
+        ]
+        self.assertEqual(nodes, expected)
+
+
+class TestTokenizeInlineRecovery(unittest.TestCase):
+    def test_valid_input_unchanged(self):
+        for text in CORPUS:
+            with self.subTest(text=text):
+                self.assertEqual(tokenize_inline(text, strict=False), tokenize_inline(text))
+
+    def test_error_corpus_does_not_raise(self):
+        for text in ERROR_CORPUS:
+            with self.subTest(text=text):
+                nodes = tokenize_inline(text, strict=False)
+                self.assertEqual(tokenize_inline(text, spans=True, strict=False), nodes)
+
+    def test_unmatched_delimiters_are_literal(self):
+        cases = {
+            "This has `no close": [TextNode("This has `no close", TextType.plaintext)],
+            "a **b": [TextNode("a **b", TextType.plaintext)],
+            "a *b": [TextNode("a *b", TextType.plaintext)],
+            "***a": [TextNode("***a", TextType.plaintext)],
+            "`ok` *a [l](u) **b": [
+                TextNode("ok", TextType.codetext),
+                TextNode(" *a ", TextType.plaintext),
+                TextNode("l", TextType.link, "u"),
+                TextNode(" **b", TextType.plaintext),
+            ],
+        }
+        for text, expected in cases.items():
+            with self.subTest(text=text):
+                self.assertEqual(tokenize_inline(text, strict=False), expected)
+
+    def test_literal_bold_not_read_as_italic(self):
+        self.assertEqual(tokenize_inline("**a*b*", strict=False), [
+            TextNode("**a", TextType.plaintext),
+            TextNode("b", TextType.italic),
+        ])
+        self.assertEqual(tokenize_inline("*a**b*", strict=False), [TextNode("a**b", TextType.italic)])
+
+    def test_long_delimiter_runs(self):
+        self.assertEqual(len(tokenize_inline("*" * 10_000)), 2_500)
+        self.assertEqual(tokenize_inline("*" * 10_001, strict=False)[-1], TextNode("*", TextType.plaintext))
+        with self.assertRaisesRegex(Exception, "Unmatched delimiter '\\*'"):
+            tokenize_inline("*" * 10_001)
+
+
+if __name__ == "__main__":
+    unittest.main()
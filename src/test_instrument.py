@@ -0,0 +1,80 @@
+import io
+import json
+import os
+import tempfile
+import unittest
+
+import instrument
+from block_markdown import write_markdown_html
+from htmlnode import LeafNode, ParentNode
+from markdown_to_text import split_nodes_delimiter, split_nodes_image, split_nodes_link, text_to_textnodes
+from textnode import TextNode, TextType, text_node_to_html_node
+
+
+class TestInstrument(unittest.TestCase):
+    def tearDown(self):
+        instrument.set_hook(None)
+
+    def test_disabled_by_default(self):
+        self.assertIsNone(instrument.hook)
+
+    def test_hook_receives_stage_calls(self):
+        calls = []
+        instrument.set_hook(lambda stage, seconds, nodes: calls.append((stage, nodes)))
+        split_nodes_delimiter([TextNode("a **b** c", TextType.plaintext)], "**", TextType.bold)
+        split_nodes_image([TextNode("![i](x)", TextType.plaintext)])
+        split_nodes_link([TextNode("[l](y) z", TextType.plaintext)])
+        self.assertEqual(calls, [("split_nodes_delimiter", 3), ("split_nodes_image", 1), ("split_nodes_link", 2)])
+
+    def test_recording_text_to_textnodes(self):
+        with instrument.recording() as recorder:
+            nodes = text_to_textnodes("**b** and *i* with `c` and [l](u)")
+        self.assertIsNone(instrument.hook)
+        stages = recorder.report()["stages"]
+        self.assertEqual(stages["split_nodes_delimiter"]["calls"], 3)
+        self.assertEqual(stages["split_nodes_image_link"]["calls"], 1)
+        # code -> 3 nodes, bold -> 5, italic -> 7; the link sweep -> 4
+        self.assertEqual(stages["split_nodes_delimiter"]["nodes"], 3 + 5 + 7)
+        self.assertEqual(stages["split_nodes_image_link"]["nodes"], 4)
+        self.assertEqual(len(nodes), 7)
+
+    def test_to_html_counts_outermost_call_and_nodes(self):
+        tree = ParentNode("div", [ParentNode("p", [LeafNode("b", "x"), LeafNode(None, "y")]), LeafNode("i", "z")])
+        with instrument.recording() as recorder:
+            tree.to_html()
+            text_node_to_html_node(TextNode("t", TextType.bold))
+        stages = recorder.report()["stages"]
+        self.assertEqual(stages["HtmlNode.to_html"], {"calls": 1, "seconds": stages["HtmlNode.to_html"]["seconds"], "nodes": 5})
+        self.assertEqual(stages["text_node_to_html_node"]["calls"], 1)
+
+    def test_write_html_recorded(self):
+        with instrument.recording() as recorder:
+            write_markdown_html(["# Title", "", "Body **b**"], io.StringIO())
+        stages = recorder.report()["stages"]
+        self.assertEqual(stages["HtmlNode.write_html"]["calls"], 2)
+        self.assertNotIn("HtmlNode.to_html", stages)
+
+    def test_write_json(self):
+        recorder = instrument.Recorder()
+        recorder("split_nodes_link", 0.5, 4)
+        recorder("split_nodes_link", 0.25, 2)
+        with tempfile.TemporaryDirectory() as tmp:
+            path = os.path.join(tmp, "profile.json")
+            recorder.write_json(path)
+            with open(path, encoding="utf-8") as f:
+                report = json.load(f)
+        self.assertEqual(report, {
+            "stages": {"split_nodes_link": {"calls": 2, "seconds": 0.75, "nodes": 6}},
+            "total_seconds": 0.75,
+        })
+
+    def test_recording_restores_previous_hook(self):
+        outer = instrument.Recorder()
+        with instrument.recording(outer):
+            with instrument.recording():
+                pass
+            self.assertIs(instrument.hook, outer)
+
+
+if __name__ == "__main__":
+    unittest.main()
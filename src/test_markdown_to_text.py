@@ -1,6 +1,10 @@
+import itertools
+import types
 import unittest
-from textnode import TextNode, TextType
+from textnode import TextNode, TextNodeArray, TextSpan, TextType
 from markdown_to_text import split_nodes_delimiter, extract_markdown_images, extract_markdown_links, split_nodes_image, split_nodes_link, text_to_textnodes
+from markdown_to_text import iter_split_nodes_delimiter, iter_split_nodes_image, iter_split_nodes_link, iter_text_to_textnodes
+from markdown_to_text import split_nodes_image_link, split_nodes_code, split_nodes_bold, split_nodes_italic, text_to_textnode_array
 
 
 class TestMarkdownToText(unittest.TestCase):
@@ -906,6 +910,170 @@ class TestTextToTextNodes(unittest.TestCase):
         self.assertEqual(nodes, expected)
     
 
+class TestSplitNodesImageLink(unittest.TestCase):
+    def test_images_and_links_in_one_sweep(self):
+        node = TextNode("See ![img](a.png) and [link](b.html)!", TextType.plaintext)
+        self.assertEqual(split_nodes_image_link([node]), [
+            TextNode("See ", TextType.plaintext),
+            TextNode("img", TextType.image, "a.png"),
+            TextNode(" and ", TextType.plaintext),
+            TextNode("link", TextType.link, "b.html"),
+            TextNode("!", TextType.plaintext),
+        ])
+
+    def test_matches_separate_passes(self):
+        texts = [
+            "",
+            "no markup here",
+            "![a](b)[c](d)",
+            "!![a](b)",
+            "![x](u[a](b)",
+            "[l](u)![i](v)[l2](w)",
+            "![](empty-alt)[](empty-link)",
+            "[broken](link and ![img](ok.png)",
+        ]
+        for text in texts:
+            with self.subTest(text=text):
+                nodes = [TextNode(text, TextType.plaintext), TextNode("[x](y)", TextType.bold)]
+                self.assertEqual(split_nodes_image_link(nodes), split_nodes_link(split_nodes_image(nodes)))
+
+
+class TestRecovery(unittest.TestCase):
+    def test_unmatched_delimiter_kept_literal(self):
+        node = TextNode("a `b` c `d", TextType.plaintext)
+        self.assertEqual(split_nodes_delimiter([node], "`", TextType.codetext, strict=False), [
+            TextNode("a ", TextType.plaintext),
+            TextNode("b", TextType.codetext),
+            TextNode(" c `d", TextType.plaintext),
+        ])
+
+    def test_wrappers_pass_strict(self):
+        node = TextNode("x **y", TextType.plaintext)
+        self.assertEqual(split_nodes_bold([node], strict=False), [node])
+        with self.assertRaises(Exception):
+            split_nodes_bold([node])
+
+    def test_strict_raises_before_splitting(self):
+        # An odd delimiter count fails before any pair is split off.
+        gen = iter_split_nodes_delimiter([TextNode("`a` `b` `c", TextType.plaintext)], "`", TextType.codetext)
+        with self.assertRaisesRegex(Exception, "Unmatched delimiter '`'"):
+            next(gen)
+
+    def test_text_to_textnodes_recovery(self):
+        self.assertEqual(text_to_textnodes("**bold** and *open", strict=False), [
+            TextNode("bold", TextType.bold),
+            TextNode(" and *open", TextType.plaintext),
+        ])
+        text = "This is **bold**, *italic*, `code`, ![image](img.jpg), and [link](url)"
+        self.assertEqual(text_to_textnodes(text, strict=False), text_to_textnodes(text))
+
+
+class TestSplitSpans(unittest.TestCase):
+    SOURCE = ">>> Some `code`, **bold**, *it*, ![img](a.png) and [link](b.html) <<<"
+
+    def split_all(self, nodes):
+        for split in (split_nodes_code, split_nodes_image, split_nodes_link, split_nodes_bold, split_nodes_italic):
+            nodes = split(nodes)
+        return nodes
+
+    def test_spans_split_in_place(self):
+        start, end = 4, len(self.SOURCE) - 4
+        pieces = self.split_all([TextSpan(self.SOURCE, start, end, TextType.plaintext)])
+        self.assertEqual(pieces, self.split_all([TextNode(self.SOURCE[start:end], TextType.plaintext)]))
+        for piece in pieces:
+            self.assertIsInstance(piece, TextSpan)
+            self.assertIs(piece.source, self.SOURCE)
+
+    def test_image_link_sweep_on_spans(self):
+        span = TextSpan.from_text("![img](a.png) and [link](b.html)")
+        pieces = split_nodes_image_link([span])
+        self.assertEqual(pieces, split_nodes_image_link([TextNode(span.text, TextType.plaintext)]))
+        self.assertTrue(all(piece.source is span.source for piece in pieces))
+
+    def test_span_after_bang_matches_sliced_text(self):
+        span = TextSpan("![x](y)", 1, 7, TextType.plaintext)
+        self.assertEqual(split_nodes_link([span]), [TextNode("x", TextType.link, "y")])
+
+    def test_empty_span(self):
+        self.assertEqual(split_nodes_bold([TextSpan("abc", 1, 1, TextType.plaintext)]), [TextNode("", TextType.plaintext)])
+
+    def test_unmatched_delimiter_message_uses_span_text(self):
+        with self.assertRaises(Exception) as ctx:
+            split_nodes_bold([TextSpan("xx **open yy", 2, 10, TextType.plaintext)])
+        self.assertEqual(str(ctx.exception), "Unmatched delimiter '**' in text: ' **open '")
+
+    def test_iter_text_to_textnodes_spans(self):
+        text = "This is **bold**, *italic*, `code`, ![image](img.jpg), and [link](url)"
+        nodes = list(iter_text_to_textnodes(text, spans=True))
+        self.assertEqual(nodes, text_to_textnodes(text))
+        self.assertTrue(all(node.source is text for node in nodes))
+
+
+class TestSplitTextNodeArray(unittest.TestCase):
+    TEXT = "This is **bold**, *italic*, `code`, ![image](img.jpg), and [link](url)!![x](y)"
+
+    def test_split_functions_return_arrays(self):
+        nodes = TextNodeArray.from_text(self.TEXT)
+        plain = [TextNode(self.TEXT, TextType.plaintext)]
+        for split in (split_nodes_code, split_nodes_image_link, split_nodes_image, split_nodes_link):
+            with self.subTest(split.__name__):
+                result = split(nodes)
+                self.assertIsInstance(result, TextNodeArray)
+                self.assertIs(result.source, self.TEXT)
+                self.assertEqual(result, split(plain))
+        result = split_nodes_delimiter(nodes, "**", TextType.bold)
+        self.assertEqual(result, split_nodes_delimiter(plain, "**", TextType.bold))
+
+    def test_text_to_textnode_array(self):
+        nodes = text_to_textnode_array(self.TEXT)
+        self.assertIsInstance(nodes, TextNodeArray)
+        self.assertEqual(nodes, text_to_textnodes(self.TEXT))
+        self.assertEqual(text_to_textnode_array(""), [TextNode("", TextType.plaintext)])
+
+    def test_errors_match_list_pipeline(self):
+        for text in ("`open", "**open", "*open", "*a* then **b"):
+            with self.subTest(text=text):
+                with self.assertRaises(Exception) as expected:
+                    text_to_textnodes(text)
+                with self.assertRaises(Exception) as actual:
+                    text_to_textnode_array(text)
+                self.assertEqual(str(actual.exception), str(expected.exception))
+
+
+class TestIterSplitNodes(unittest.TestCase):
+    def test_returns_generator(self):
+        node = TextNode("a **b** c", TextType.plaintext)
+        self.assertIsInstance(iter_split_nodes_delimiter([node], "**", TextType.bold), types.GeneratorType)
+        self.assertIsInstance(iter_split_nodes_image([node]), types.GeneratorType)
+        self.assertIsInstance(iter_split_nodes_link([node]), types.GeneratorType)
+
+    def test_consumes_input_lazily(self):
+        source = (TextNode(f"**{i}** x", TextType.plaintext) for i in itertools.count())
+        first = list(itertools.islice(iter_split_nodes_delimiter(source, "**", TextType.bold), 4))
+        self.assertEqual(first, [
+            TextNode("0", TextType.bold),
+            TextNode(" x", TextType.plaintext),
+            TextNode("1", TextType.bold),
+            TextNode(" x", TextType.plaintext),
+        ])
+
+    def test_chained_stages(self):
+        nodes = [TextNode("![img](a.png) and [link](b.html)", TextType.plaintext)]
+        chained = list(iter_split_nodes_link(iter_split_nodes_image(nodes)))
+        self.assertEqual(chained, split_nodes_link(split_nodes_image(nodes)))
+
+    def test_error_raised_on_iteration(self):
+        gen = iter_split_nodes_delimiter([TextNode("`open", TextType.plaintext)], "`", TextType.codetext)
+        with self.assertRaises(Exception) as ctx:
+            list(gen)
+        self.assertIn("Unmatched delimiter", str(ctx.exception))
+
+    def test_iter_text_to_textnodes_matches_list(self):
+        text = "This is **bold**, *italic*, `code`, ![image](img.jpg), and [link](url)"
+        self.assertEqual(list(iter_text_to_textnodes(text)), text_to_textnodes(text))
+        self.assertEqual(list(iter_text_to_textnodes("")), [TextNode("", TextType.plaintext)])
+
+
 if __name__ == "__main__":
     unittest.main()
 
@@ -0,0 +1,123 @@
+"""Operation-count and allocation budgets for the hot paths.
+
+These count node constructions and helper calls, or measure traced
+allocations, rather than wall time, so they give the same answer on any
+machine. The budgets sit a little above the current counts; a change that
+goes over one is a performance regression, even if every output stays
+correct.
+"""
+import contextlib
+import tracemalloc
+import unittest
+from unittest import mock
+
+import htmlnode
+from block_markdown import markdown_to_html_node
+from htmlnode import HtmlNode, LeafNode, ParentNode
+from inline_scanner import tokenize_inline
+from markdown_to_text import text_to_textnodes
+from textnode import TextNode, TextSpan, text_node_to_html_node
+
+# 8 spans per repeat: bold, italic, code and link, each followed by a space.
+PARAGRAPH = "**b** *i* `c` [l](u) " * 1250
+PARAGRAPH_SPANS = 10_000
+
+
+@contextlib.contextmanager
+def count_calls(owner, name):
+    original = getattr(owner, name)
+    with mock.patch.object(owner, name, autospec=True, side_effect=original) as patched:
+        yield patched
+
+
+@contextlib.contextmanager
+def count_textnodes():
+    # TextSpan.__init__ does not call TextNode.__init__, so count both.
+    counts = {}
+    with count_calls(TextNode, "__init__") as nodes, count_calls(TextSpan, "__init__") as spans:
+        yield counts
+    counts["total"] = nodes.call_count + spans.call_count
+
+
+def traced_peak(func):
+    tracemalloc.start()
+    try:
+        result = func()
+        return result, tracemalloc.get_traced_memory()[1]
+    finally:
+        tracemalloc.stop()
+
+
+class TestInlineBudgets(unittest.TestCase):
+    def test_text_to_textnodes_node_allocations(self):
+        with count_textnodes() as counts:
+            nodes = text_to_textnodes(PARAGRAPH)
+        self.assertEqual(len(nodes), PARAGRAPH_SPANS)
+        # Each pass rebuilds the nodes it splits; 17,503 today.
+        self.assertLessEqual(counts["total"], 18_000)
+
+    def test_tokenize_inline_allocates_only_output_nodes(self):
+        for spans in (False, True):
+            with self.subTest(spans=spans):
+                with count_textnodes() as counts:
+                    nodes = tokenize_inline(PARAGRAPH, spans=spans)
+                self.assertEqual(counts["total"], len(nodes))
+                self.assertEqual(len(nodes), PARAGRAPH_SPANS)
+
+    def test_unmatched_delimiter_fails_before_splitting(self):
+        text = "`a` " * 5_000 + "`"
+        with count_textnodes() as counts:
+            with self.assertRaises(Exception):
+                text_to_textnodes(text)
+        self.assertEqual(counts["total"], 1)
+        with count_textnodes() as counts:
+            with self.assertRaises(Exception):
+                tokenize_inline(text)
+        self.assertEqual(counts["total"], 0)
+
+    def test_peak_memory_per_node(self):
+        # Bytes of traced allocation at peak, per output node.
+        budgets = {
+            "text_to_textnodes": (lambda: text_to_textnodes(PARAGRAPH), 150),
+            "tokenize_inline": (lambda: tokenize_inline(PARAGRAPH), 100),
+            "tokenize_inline spans": (lambda: tokenize_inline(PARAGRAPH, spans=True), 200),
+        }
+        for name, (func, per_node) in budgets.items():
+            with self.subTest(name):
+                nodes, peak = traced_peak(func)
+                self.assertLessEqual(peak, per_node * len(nodes))
+
+
+class TestRenderBudgets(unittest.TestCase):
+    def setUp(self):
+        htmlnode.clear_props_cache()
+
+    def test_one_leaf_per_textnode(self):
+        nodes = text_to_textnodes(PARAGRAPH)
+        with count_calls(HtmlNode, "__init__") as init:
+            leaves = [text_node_to_html_node(node) for node in nodes]
+        self.assertEqual(init.call_count, len(leaves))
+
+    def test_page_tree_allocations(self):
+        markdown = "\n\n".join(["Some **bold** and [a link](/x) here."] * 100)
+        with count_calls(HtmlNode, "__init__") as init:
+            markdown_to_html_node(markdown)
+        # One div, one p per paragraph and five leaves per paragraph.
+        self.assertEqual(init.call_count, 1 + 100 * 6)
+
+    def test_repeated_props_rendered_once(self):
+        leaves = [LeafNode("a", "x", {"href": "/docs", "class": "nav"}) for _ in range(1_000)]
+        tree = ParentNode("div", leaves)
+        with mock.patch.object(htmlnode, "_render_props", wraps=htmlnode._render_props) as render_props:
+            tree.to_html()
+        self.assertEqual(render_props.call_count, 1)
+
+    def test_render_peak_memory(self):
+        tree = ParentNode("div", [text_node_to_html_node(node) for node in text_to_textnodes(PARAGRAPH)])
+        html, peak = traced_peak(tree.to_html)
+        # The output string plus one small chunk string per leaf.
+        self.assertLessEqual(peak, len(html) + 50 * PARAGRAPH_SPANS)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,118 @@
+import os
+import tempfile
+import unittest
+
+from block_markdown import markdown_to_html_node
+from render_cache import RenderCache, render_inline
+from textnode import text_node_to_html_node
+from markdown_to_text import text_to_textnodes
+
+
+class TestRenderCache(unittest.TestCase):
+    def test_renders_like_pipeline(self):
+        text = "See **bold**, `code` and [docs](/docs)"
+        expected = "".join(text_node_to_html_node(node).to_html() for node in text_to_textnodes(text))
+        self.assertEqual(render_inline(text), expected)
+        self.assertEqual(RenderCache().render(text), expected)
+
+    def test_hits_and_misses(self):
+        calls = []
+        cache = RenderCache(render=lambda text: calls.append(text) or text.upper())
+        self.assertEqual(cache.render("nav"), "NAV")
+        self.assertEqual(cache.render("nav"), "NAV")
+        self.assertEqual(cache.render("footer"), "FOOTER")
+        self.assertEqual(calls, ["nav", "footer"])
+        stats = cache.stats()
+        self.assertEqual((stats["hits"], stats["misses"], stats["entries"]), (1, 2, 2))
+        self.assertAlmostEqual(stats["hit_rate"], 1 / 3)
+
+    def test_max_entries_evicts_least_recently_used(self):
+        cache = RenderCache(max_entries=2, render=str.upper)
+        cache.render("a")
+        cache.render("b")
+        cache.render("a")
+        cache.render("c")
+        self.assertEqual(len(cache), 2)
+        self.assertEqual(cache.stats()["evictions"], 1)
+        cache.render("a")
+        self.assertEqual(cache.stats()["hits"], 2)
+        cache.render("b")
+        self.assertEqual(cache.stats()["misses"], 4)
+
+    def test_max_bytes_bounds_size(self):
+        cache = RenderCache(max_bytes=1000, render=str.upper)
+        for i in range(100):
+            cache.render(f"snippet number {i}")
+        self.assertLessEqual(cache.stats()["bytes"], 1000)
+        self.assertGreater(len(cache), 0)
+
+    def test_oversized_entry_not_cached(self):
+        cache = RenderCache(max_bytes=100, render=str.upper)
+        cache.render("x" * 500)
+        self.assertEqual(len(cache), 0)
+
+    def test_errors_not_cached(self):
+        cache = RenderCache()
+        for _ in range(2):
+            with self.assertRaises(Exception):
+                cache.render("**open")
+        self.assertEqual(len(cache), 0)
+
+    def test_invalid_bounds(self):
+        with self.assertRaises(ValueError):
+            RenderCache(max_entries=0)
+
+    def test_persistent_tier_survives_reopen(self):
+        with tempfile.TemporaryDirectory() as tmp:
+            path = os.path.join(tmp, "inline-cache")
+            with RenderCache(path=path) as cache:
+                first = cache.render("a **b**")
+            with RenderCache(path=path) as cache:
+                self.assertEqual(cache.render("a **b**"), first)
+                self.assertEqual(cache.stats()["disk_hits"], 1)
+
+    def test_persistent_tier_tied_to_render_function(self):
+        with tempfile.TemporaryDirectory() as tmp:
+            path = os.path.join(tmp, "inline-cache")
+            with RenderCache(path=path) as cache:
+                cache.render("a **b**")
+            def shout(text):
+                return text.upper()
+            with RenderCache(path=path, render=shout) as cache:
+                self.assertEqual(cache.render("a **b**"), "A **B**")
+                self.assertEqual(cache.stats()["disk_hits"], 0)
+            with RenderCache(path=path) as cache:
+                self.assertEqual(cache.render("a **b**"), "a <b>b</b>")
+                self.assertEqual(cache.stats()["disk_hits"], 0)
+
+    def test_persistent_tier_pruned_on_close(self):
+        with tempfile.TemporaryDirectory() as tmp:
+            path = os.path.join(tmp, "inline-cache")
+            with RenderCache(path=path, max_disk_entries=3) as cache:
+                for text in ("one", "two", "three"):
+                    cache.render(text)
+            # Within the limit, snippets not used in this session stay.
+            with RenderCache(path=path, max_disk_entries=3) as cache:
+                cache.render("one")
+            with RenderCache(path=path, max_disk_entries=3) as cache:
+                self.assertEqual(len(cache._db), 4)
+                cache.render("two")
+                cache.render("four")
+                cache.render("two")
+            with RenderCache(path=path, max_disk_entries=3) as cache:
+                self.assertEqual(len(cache._db), 3)
+                cache.render("four")
+                cache.render("two")
+                self.assertEqual(cache.stats()["disk_hits"], 2)
+                cache.render("one")
+                self.assertEqual(cache.stats()["disk_hits"], 2)
+
+    def test_cached_blocks_render_the_same(self):
+        markdown = "# Title *x*\n\n- [home](/)\n- [about](/about)\n\nBody **text**\n\n- [home](/)"
+        cache = RenderCache()
+        self.assertEqual(markdown_to_html_node(markdown, cache).to_html(), markdown_to_html_node(markdown).to_html())
+        self.assertEqual(cache.stats()["hits"], 1)
+
+
+if __name__ == "__main__":
+    unittest.main()
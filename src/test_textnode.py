@@ -1,6 +1,6 @@
 import unittest
 
-from textnode import TextNode, TextType
+from textnode import TextNode, TextNodeArray, TextSpan, TextType, render_textnodes, text_node_to_html_node, text_node_to_html
 from htmlnode import HtmlNode, LeafNode, ParentNode
 
 
@@ -13,7 +13,157 @@ class TestTextNode(unittest.TestCase):
         self.assertFalse(node != node2)
         self.assertNotEqual(node, TextNode("Different text", TextType.bold, None))
 
+    def test_slots_no_instance_dict(self):
+        node = TextNode("text", TextType.link, "https://example.com")
+        self.assertFalse(hasattr(node, "__dict__"))
+        with self.assertRaises(AttributeError):
+            node.extra = 1
+
+    def test_repr(self):
+        node = TextNode("text", TextType.link, "https://example.com")
+        self.assertEqual(repr(node), "TextNode(text=text, text_type=TextType.link, url=https://example.com)")
+
+
+
+class TestTextSpan(unittest.TestCase):
+    def test_text_is_slice_of_source(self):
+        span = TextSpan("hello world", 6, 11, TextType.bold)
+        self.assertEqual(span.text, "world")
+        self.assertIsInstance(span, TextNode)
+
+    def test_equality_with_text_node(self):
+        span = TextSpan("see [docs](/d)", 5, 9, TextType.link, "/d")
+        node = TextNode("docs", TextType.link, "/d")
+        self.assertEqual(span, node)
+        self.assertEqual(node, span)
+        self.assertNotEqual(span, TextNode("docs", TextType.link, "/other"))
+
+    def test_repr_matches_text_node(self):
+        span = TextSpan("xx*it*", 3, 5, TextType.italic)
+        self.assertEqual(repr(span), repr(TextNode("it", TextType.italic)))
+
+    def test_from_text(self):
+        span = TextSpan.from_text("whole")
+        self.assertEqual((span.source, span.start, span.end), ("whole", 0, 5))
+        self.assertEqual(span.text_type, TextType.plaintext)
+
+    def test_assigning_text_replaces_span(self):
+        span = TextSpan("hello world", 0, 5, TextType.plaintext)
+        span.text = "bye"
+        self.assertEqual((span.source, span.start, span.end, span.text), ("bye", 0, 3, "bye"))
+
+    def test_renders_like_text_node(self):
+        span = TextSpan("a **b** c", 4, 5, TextType.bold)
+        self.assertEqual(text_node_to_html(span), "<b>b</b>")
+        self.assertEqual(text_node_to_html_node(span).to_html(), "<b>b</b>")
+        self.assertEqual(render_textnodes([span]), "<b>b</b>")
+
+
+class TestRenderTextnodes(unittest.TestCase):
+    def test_matches_per_node_rendering(self):
+        nodes = [
+            TextNode("Start ", TextType.plaintext),
+            TextNode("and ", TextType.plaintext),
+            TextNode("bold", TextType.bold),
+            TextNode(" ", TextType.plaintext),
+            TextNode("it", TextType.italic),
+            TextNode("x = 1", TextType.codetext),
+            TextNode("link", TextType.link, "https://example.com"),
+            TextNode("bare", TextType.link),
+            TextNode("alt", TextType.image, "img.png"),
+            TextNode("", TextType.plaintext),
+            TextNode(7, TextType.bold),
+        ]
+        expected = "".join(text_node_to_html_node(node).to_html() for node in nodes)
+        self.assertEqual(render_textnodes(nodes), expected)
+
+    def test_empty_sequence(self):
+        self.assertEqual(render_textnodes([]), "")
+
+    def test_accepts_iterators(self):
+        nodes = (TextNode(word, TextType.plaintext) for word in ("a", "b", "c"))
+        self.assertEqual(render_textnodes(nodes), "abc")
+
+    def test_missing_text_raises(self):
+        with self.assertRaises(ValueError):
+            render_textnodes([TextNode(None, TextType.plaintext)])
+        with self.assertRaises(ValueError):
+            render_textnodes([TextNode(None, TextType.bold)])
+
+    def test_invalid_text_type_raises(self):
+        with self.assertRaises(Exception) as context:
+            render_textnodes([TextNode("x", "invalid_type")])
+        self.assertIn("Unsupported TextType", str(context.exception))
     
 
+
+class TestTextNodeArray(unittest.TestCase):
+    def sample(self):
+        nodes = TextNodeArray("see [docs](/d) and [more](/d) or **this**")
+        nodes.append(TextType.plaintext, 0, 4)
+        nodes.append(TextType.link, 5, 9, "/d")
+        nodes.append(TextType.plaintext, 14, 19)
+        nodes.append(TextType.link, 20, 24, "/d")
+        nodes.append(TextType.plaintext, 29, 33)
+        nodes.append(TextType.bold, 35, 39)
+        return nodes
+
+    def test_sequence_of_spans(self):
+        nodes = self.sample()
+        self.assertEqual(len(nodes), 6)
+        self.assertEqual(nodes[1], TextNode("docs", TextType.link, "/d"))
+        self.assertEqual(nodes[-1], TextNode("this", TextType.bold))
+        self.assertEqual(nodes.text(2), " and ")
+        self.assertTrue(all(isinstance(node, TextSpan) and node.source is nodes.source for node in nodes))
+        self.assertEqual(nodes, list(nodes))
+
+    def test_urls_interned(self):
+        nodes = self.sample()
+        self.assertEqual(nodes.url_table, [None, "/d"])
+        self.assertEqual(list(nodes.url_ids), [0, 1, 0, 1, 0, 0])
+
+    def test_compact_storage(self):
+        self.assertEqual(self.sample().nbytes(), 6 * 21)
+
+    def test_from_nodes_joins_texts(self):
+        source = [TextNode("a ", TextType.plaintext), TextNode("b", TextType.italic), TextNode("c", TextType.link, "u")]
+        nodes = TextNodeArray.from_nodes(source)
+        self.assertEqual(nodes.source, "a bc")
+        self.assertEqual(nodes, source)
+
+    def test_from_nodes_keeps_shared_source(self):
+        text = "x **y**"
+        spans = [TextSpan(text, 0, 2, TextType.plaintext), TextSpan(text, 4, 5, TextType.bold)]
+        self.assertIs(TextNodeArray.from_nodes(spans).source, text)
+
+    def test_derive_rejects_foreign_spans(self):
+        nodes = TextNodeArray.from_text("abc")
+        with self.assertRaises(ValueError):
+            nodes.derive([TextSpan("xyz", 0, 1, TextType.plaintext)])
+        with self.assertRaises(ValueError):
+            nodes.derive([TextNode("a", TextType.plaintext)])
+
+    def test_invalid_text_type(self):
+        nodes = TextNodeArray("abc")
+        with self.assertRaisesRegex(Exception, "TextNode must have a text_type"):
+            nodes.append(None, 0, 1)
+        with self.assertRaisesRegex(Exception, "Unsupported TextType"):
+            nodes.append("bold", 0, 1)
+        self.assertEqual(len(nodes), 0)
+
+    def test_render_matches_node_list(self):
+        nodes = self.sample()
+        nodes.append(TextType.image, 0, 3, "/img.png")
+        nodes.append(TextType.image, 0, 3)
+        nodes.append(TextType.link, 0, 3)
+        nodes.append(TextType.italic, 0, 3)
+        nodes.append(TextType.codetext, 0, 3)
+        self.assertEqual(render_textnodes(nodes), render_textnodes(list(nodes)))
+        self.assertEqual(
+            "".join(text_node_to_html_node(node).to_html() for node in nodes),
+            render_textnodes(nodes),
+        )
+
+
 if __name__ == "__main__":
-    unittest.main()
\ No newline at end of file
+    unittest.main()
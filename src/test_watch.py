@@ -0,0 +1,162 @@
+import os
+import shutil
+import tempfile
+import unittest
+from unittest import mock
+
+from build import build, find_sources
+from watch import Watcher, scan_sources
+
+
+def write(path, text):
+    os.makedirs(os.path.dirname(path), exist_ok=True)
+    with open(path, "w", encoding="utf-8") as f:
+        f.write(text)
+    # Polling compares mtime and size; make every write visible.
+    write.tick += 1
+    os.utime(path, ns=(write.tick * 10**9, write.tick * 10**9))
+
+
+write.tick = 1
+
+
+def read(path):
+    with open(path, encoding="utf-8") as f:
+        return f.read()
+
+
+def read_bytes(path):
+    with open(path, "rb") as f:
+        return f.read()
+
+
+class TestWatcher(unittest.TestCase):
+    def setUp(self):
+        self.tmp = tempfile.TemporaryDirectory()
+        self.content = os.path.join(self.tmp.name, "content")
+        self.output = os.path.join(self.tmp.name, "public")
+        write(os.path.join(self.content, "index.md"), "# Home\n\nHello *there*\n\n- one\n- two")
+        write(os.path.join(self.content, "blog", "post.md"), "A **post**")
+        self.watcher = Watcher(self.content, self.output)
+        self.watcher.start()
+
+    def tearDown(self):
+        self.tmp.cleanup()
+
+    def assert_matches_build(self, source):
+        fresh = os.path.join(self.tmp.name, "fresh")
+        build(self.content, fresh, force=True)
+        html = os.path.splitext(source)[0] + ".html"
+        self.assertEqual(read_bytes(os.path.join(self.output, html)), read_bytes(os.path.join(fresh, html)))
+
+    def test_scan_sources(self):
+        self.assertEqual(sorted(scan_sources(self.content)), [os.path.join("blog", "post.md"), "index.md"])
+
+    def test_symlinked_directories_not_followed(self):
+        write(os.path.join(self.tmp.name, "ext", "b.md"), "outside")
+        try:
+            os.symlink(os.path.join(self.tmp.name, "ext"), os.path.join(self.content, "linked"))
+            os.symlink(self.content, os.path.join(self.content, "blog", "loop"))
+        except (OSError, NotImplementedError):
+            self.skipTest("symlinks not supported")
+        self.assertEqual(sorted(scan_sources(self.content)), find_sources(self.content))
+        self.assertEqual(self.watcher.poll()["built"], [])
+
+    def test_sources_vanishing_mid_scan(self):
+        real_scandir = os.scandir
+
+        class Listing(list):
+            def __enter__(self):
+                return self
+
+            def __exit__(self, *exc_info):
+                pass
+
+        def racing_scandir(directory):
+            # List the root, then delete a page and a subdirectory before
+            # they are stat'ed or descended into.
+            entries = Listing(real_scandir(directory))
+            if directory == self.content:
+                os.remove(os.path.join(self.content, "index.md"))
+                shutil.rmtree(os.path.join(self.content, "blog"))
+            return entries
+
+        with mock.patch("watch.os.scandir", racing_scandir):
+            report = self.watcher.poll()
+        self.assertEqual(report["removed"], [os.path.join("blog", "post.md"), "index.md"])
+        self.assertEqual(report["errors"], {})
+
+    def test_missing_content_dir_raises(self):
+        shutil.rmtree(self.content)
+        with self.assertRaises(FileNotFoundError):
+            scan_sources(self.content)
+
+    def test_no_changes(self):
+        report = self.watcher.poll()
+        self.assertEqual((report["built"], report["removed"], report["errors"]), ([], [], {}))
+
+    def test_changed_page_rebuilt(self):
+        write(os.path.join(self.content, "index.md"), "# Home\n\nHello `code`\n\n- one\n- two")
+        report = self.watcher.poll()
+        self.assertEqual(report["built"], ["index.md"])
+        self.assert_matches_build("index.md")
+
+    def test_unchanged_blocks_reused(self):
+        path = os.path.join(self.content, "index.md")
+        write(path, "# Home\n\nHello `code`\n\n- one\n- two")
+        self.watcher.poll()
+        write(path, "# Home\n\nHello `code`\n\n- one\n- two\n- three\n\n# Home")
+        report = self.watcher.poll()
+        self.assertEqual((report["rendered"], report["reused"]), (1, 3))
+        self.assert_matches_build("index.md")
+
+    def test_new_and_removed_pages(self):
+        write(os.path.join(self.content, "new.md"), "fresh")
+        os.remove(os.path.join(self.content, "blog", "post.md"))
+        report = self.watcher.poll()
+        self.assertEqual(report["built"], ["new.md"])
+        self.assertEqual(report["removed"], [os.path.join("blog", "post.md")])
+        self.assertEqual(read(os.path.join(self.output, "new.html")), "<div><p>fresh</p></div>")
+        self.assertFalse(os.path.exists(os.path.join(self.output, "blog", "post.html")))
+
+    def test_error_keeps_old_output_and_retries(self):
+        path = os.path.join(self.content, "blog", "post.md")
+        before = read(os.path.join(self.output, "blog", "post.html"))
+        write(path, "```\nnot closed yet")
+        report = self.watcher.poll()
+        self.assertIn("Unclosed code block", report["errors"][os.path.join("blog", "post.md")])
+        self.assertEqual(read(os.path.join(self.output, "blog", "post.html")), before)
+        self.assertEqual(self.watcher.poll()["errors"].keys(), report["errors"].keys())
+
+        write(path, "```\nclosed\n```")
+        report = self.watcher.poll()
+        self.assertEqual((report["built"], report["errors"]), ([os.path.join("blog", "post.md")], {}))
+        self.assert_matches_build(os.path.join("blog", "post.md"))
+
+    def test_poll_selected_sources(self):
+        write(os.path.join(self.content, "index.md"), "changed")
+        write(os.path.join(self.content, "blog", "post.md"), "changed too")
+        write(os.path.join(self.content, "new.md"), "new")
+        report = self.watcher.poll(["index.md"])
+        self.assertEqual((report["built"], report["removed"]), (["index.md"], []))
+        self.assertEqual(read(os.path.join(self.output, "index.html")), "<div><p>changed</p></div>")
+
+        os.remove(os.path.join(self.content, "index.md"))
+        report = self.watcher.poll(["index.md"])
+        self.assertEqual(report["removed"], ["index.md"])
+
+        report = self.watcher.poll()
+        self.assertEqual(report["built"], [os.path.join("blog", "post.md"), "new.md"])
+
+    def test_failed_page_removed(self):
+        path = os.path.join(self.content, "blog", "post.md")
+        write(path, "```\nnot closed yet")
+        self.watcher.poll()
+        os.remove(path)
+        report = self.watcher.poll()
+        self.assertEqual(report["removed"], [os.path.join("blog", "post.md")])
+        self.assertFalse(os.path.exists(os.path.join(self.output, "blog", "post.html")))
+
+
+if __name__ == "__main__":
+    unittest.main()
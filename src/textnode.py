@@ -1,5 +1,8 @@
+from array import array
 from enum import Enum
 from htmlnode import LeafNode
+from time import perf_counter
+import instrument
 
 class TextType(Enum):
     plaintext = "plaintext"
@@ -10,6 +13,8 @@ class TextType(Enum):
     image = "image"
 
 class TextNode:
+    __slots__ = ("text", "text_type", "url")
+
     def __init__(self, text, text_type, url = None):
         self.text = text
         self.text_type = text_type
@@ -24,21 +29,312 @@ class TextNode:
     def __repr__(self):
         return f"TextNode(text={self.text}, text_type={self.text_type}, url={self.url})"
 
+class TextSpan(TextNode):
+    """A TextNode whose text is `source[start:end]`.
+
+    The slice is only taken when `.text` is read, so splitting a long
+    document into spans does not copy it. Equality and repr go through
+    `.text` and match an equivalent TextNode. Assigning `.text` replaces the
+    span with the given string.
+    """
+    __slots__ = ("source", "start", "end")
+
+    def __init__(self, source, start, end, text_type, url = None):
+        self.source = source
+        self.start = start
+        self.end = end
+        self.text_type = text_type
+        self.url = url
+
+    @classmethod
+    def from_text(cls, text, text_type = TextType.plaintext, url = None):
+        return cls(text, 0, len(text), text_type, url)
+
+    @property
+    def text(self):
+        return self.source[self.start:self.end]
+
+    @text.setter
+    def text(self, value):
+        self.source = value
+        self.start = 0
+        self.end = len(value)
+
+# TextType <-> the one-byte code a TextNodeArray stores for it.
+TEXT_TYPE_CODES = {text_type: code for code, text_type in enumerate(TextType)}
+CODE_TEXT_TYPES = tuple(TextType)
+
+class TextNodeArray:
+    """A compact sequence of text nodes stored as parallel arrays.
+
+    Node `i` has type `CODE_TEXT_TYPES[types[i]]`, text
+    `source[starts[i]:ends[i]]` and url `url_table[url_ids[i]]`. URLs are
+    interned, so a URL used by many links is stored once; entry 0 is None.
+    Each node costs 21 bytes of array storage instead of a TextNode object
+    and its own text string.
+
+    Indexing and iteration return TextSpans over `source`, which compare
+    equal to the matching TextNodes. The split functions in
+    markdown_to_text accept an array and return one; render_textnodes
+    renders an array without creating any node objects.
+    """
+    __slots__ = ("source", "types", "starts", "ends", "url_ids", "url_table", "_url_index")
+
+    def __init__(self, source = ""):
+        self.source = source
+        self.types = array("B")
+        self.starts = array("q")
+        self.ends = array("q")
+        self.url_ids = array("I")
+        self.url_table = [None]
+        self._url_index = {None: 0}
+
+    @classmethod
+    def from_text(cls, text, text_type = TextType.plaintext, url = None):
+        nodes = cls(text)
+        nodes.append(text_type, 0, len(text), url)
+        return nodes
+
+    @classmethod
+    def from_nodes(cls, nodes):
+        """Build an array from TextNodes. Spans that all share one source
+        keep it; otherwise the texts are joined into a new source."""
+        nodes = list(nodes)
+        if nodes and all(type(node) is TextSpan and node.source is nodes[0].source for node in nodes):
+            return cls(nodes[0].source).derive(nodes)
+        texts = []
+        result = cls()
+        offset = 0
+        for node in nodes:
+            text = node.text
+            if type(text) is not str:
+                raise TypeError(f"TextNodeArray needs str text, got {text!r}")
+            texts.append(text)
+            result.append(node.text_type, offset, offset + len(text), node.url)
+            offset += len(text)
+        result.source = "".join(texts)
+        return result
+
+    def derive(self, spans = ()):
+        """Return a new array over the same source and URL table holding
+        `spans`, which must be TextSpans over that source."""
+        result = TextNodeArray(self.source)
+        result.url_table = self.url_table
+        result._url_index = self._url_index
+        source = self.source
+        add_type = result.types.append
+        add_start = result.starts.append
+        add_end = result.ends.append
+        add_url = result.url_ids.append
+        url_index = self._url_index
+        for span in spans:
+            if type(span) is not TextSpan or span.source is not source:
+                raise ValueError("TextNodeArray.derive needs TextSpans over the array's source")
+            url_id = url_index.get(span.url)
+            if url_id is None:
+                # Also validates the type before anything is stored.
+                result.append(span.text_type, span.start, span.end, span.url)
+                continue
+            add_type(TEXT_TYPE_CODES[span.text_type])
+            add_start(span.start)
+            add_end(span.end)
+            add_url(url_id)
+        return result
+
+    def append(self, text_type, start, end, url = None):
+        try:
+            code = TEXT_TYPE_CODES[text_type]
+        except (KeyError, TypeError):
+            if text_type == None:
+                raise Exception("TextNode must have a text_type")
+            raise Exception(f"Unsupported TextType: {text_type}")
+        url_id = self._url_index.get(url)
+        if url_id is None:
+            url_id = self._url_index[url] = len(self.url_table)
+            self.url_table.append(url)
+        self.types.append(code)
+        self.starts.append(start)
+        self.ends.append(end)
+        self.url_ids.append(url_id)
+
+    def text(self, index):
+        return self.source[self.starts[index]:self.ends[index]]
+
+    def nbytes(self):
+        """Bytes held by the parallel arrays (not the source or URLs)."""
+        return sum(len(column) * column.itemsize for column in (self.types, self.starts, self.ends, self.url_ids))
+
+    def __len__(self):
+        return len(self.types)
+
+    def __getitem__(self, index):
+        return TextSpan(self.source, self.starts[index], self.ends[index],
+                        CODE_TEXT_TYPES[self.types[index]], self.url_table[self.url_ids[index]])
+
+    def __iter__(self):
+        source = self.source
+        url_table = self.url_table
+        for code, start, end, url_id in zip(self.types, self.starts, self.ends, self.url_ids):
+            yield TextSpan(source, start, end, CODE_TEXT_TYPES[code], url_table[url_id])
+
+    def __eq__(self, other):
+        if isinstance(other, (TextNodeArray, list)):
+            return list(self) == list(other)
+        return NotImplemented
+
+    def __repr__(self):
+        return f"TextNodeArray({list(self)!r})"
+
+def _leaf_builder(tag):
+    def build(text_node):
+        return LeafNode(tag=tag, value=text_node.text, props=None)
+    return build
+
+def _link_node(text_node):
+    return LeafNode(tag="a", value=text_node.text, props={"href": text_node.url} if text_node.url else None)
+
+def _image_node(text_node):
+    return LeafNode(tag="img", value="", props={"src": text_node.url, "alt": text_node.text} if text_node.url else None)
+
+# TextType -> function building the LeafNode for a TextNode of that type.
+HTML_NODE_BUILDERS = {
+    TextType.plaintext: _leaf_builder(None),
+    TextType.bold: _leaf_builder("b"),
+    TextType.italic: _leaf_builder("i"),
+    TextType.codetext: _leaf_builder("code"),
+    TextType.link: _link_node,
+    TextType.image: _image_node,
+}
+
+def _plain_fragment(text_node):
+    if text_node.text is None:
+        raise ValueError("Leaf nodes must have a value")
+    return str(text_node.text)
+
+def _fragment_builder(tag):
+    open_tag = f"<{tag}>"
+    close_tag = f"</{tag}>"
+    def render(text_node):
+        if text_node.text is None:
+            raise ValueError("Leaf nodes must have a value")
+        return f"{open_tag}{text_node.text}{close_tag}"
+    return render
+
+def _link_html(text, url):
+    if url:
+        return f'<a href="{url}">{text}</a>'
+    return f"<a>{text}</a>"
+
+def _image_html(text, url):
+    if url:
+        return f'<img src="{url}" alt="{text}"></img>'
+    return "<img></img>"
+
+def _link_fragment(text_node):
+    if text_node.text is None:
+        raise ValueError("Leaf nodes must have a value")
+    return _link_html(text_node.text, text_node.url)
+
+def _image_fragment(text_node):
+    return _image_html(text_node.text, text_node.url)
+
+# TextType -> function rendering a TextNode of that type straight to HTML,
+# matching text_node_to_html_node(node).to_html() without the LeafNode.
+HTML_FRAGMENT_RENDERERS = {
+    TextType.plaintext: _plain_fragment,
+    TextType.bold: _fragment_builder("b"),
+    TextType.italic: _fragment_builder("i"),
+    TextType.codetext: _fragment_builder("code"),
+    TextType.link: _link_fragment,
+    TextType.image: _image_fragment,
+}
+
+def _lookup(table, text_type):
+    try:
+        handler = table.get(text_type)
+    except TypeError:
+        handler = None
+    if handler is None:
+        if text_type == None:
+            raise Exception("TextNode must have a text_type")
+        raise Exception(f"Unsupported TextType: {text_type}")
+    return handler
+
 def text_node_to_html_node(text_node):
-    if text_node.text_type == None:
-        raise Exception("TextNode must have a text_type")
-    else:
-        if text_node.text_type == TextType.plaintext:
-            return LeafNode(tag=None, value=text_node.text, props=None)
-        elif text_node.text_type == TextType.bold:
-            return LeafNode(tag="b", value=text_node.text, props=None)
-        elif text_node.text_type == TextType.italic:
-            return LeafNode(tag="i", value=text_node.text, props=None)
-        elif text_node.text_type == TextType.codetext:
-            return LeafNode(tag="code", value=text_node.text, props=None)
-        elif text_node.text_type == TextType.link:
-            return LeafNode(tag="a", value=text_node.text, props={"href": text_node.url} if text_node.url else None)
-        elif text_node.text_type == TextType.image:
-            return LeafNode(tag="img", value="", props={"src": text_node.url, "alt": text_node.text} if text_node.url else None)
+    if instrument.hook is None:
+        return _lookup(HTML_NODE_BUILDERS, text_node.text_type)(text_node)
+    start = perf_counter()
+    html_node = _lookup(HTML_NODE_BUILDERS, text_node.text_type)(text_node)
+    instrument.hook("text_node_to_html_node", perf_counter() - start, 1)
+    return html_node
+
+def text_node_to_html(text_node):
+    return _lookup(HTML_FRAGMENT_RENDERERS, text_node.text_type)(text_node)
+
+# Types that render as a bare tag pair around their text.
+_TAG_PAIRS = {
+    TextType.bold: ("<b>", "</b>"),
+    TextType.italic: ("<i>", "</i>"),
+    TextType.codetext: ("<code>", "</code>"),
+}
+
+def render_textnodes(nodes):
+    """Render an inline sequence of TextNodes into one HTML string.
+
+    Equivalent to joining text_node_to_html_node(node).to_html() for each
+    node. Plaintext and tag-pair nodes are written straight into a single
+    join buffer, so a run of adjacent plaintext nodes costs one append per
+    node and is merged by the final join; only links and images go through
+    HTML_FRAGMENT_RENDERERS.
+
+    A TextNodeArray is rendered straight from its arrays.
+    """
+    if isinstance(nodes, TextNodeArray):
+        return _render_array(nodes)
+    parts = []
+    append = parts.append
+    plaintext = TextType.plaintext
+    for node in nodes:
+        text_type = node.text_type
+        text = node.text
+        if text_type is plaintext:
+            if text is None:
+                raise ValueError("Leaf nodes must have a value")
+            append(text if type(text) is str else str(text))
+            continue
+        try:
+            pair = _TAG_PAIRS.get(text_type)
+        except TypeError:
+            pair = None
+        if pair is not None and type(text) is str:
+            append(pair[0])
+            append(text)
+            append(pair[1])
+        else:
+            append(_lookup(HTML_FRAGMENT_RENDERERS, text_type)(node))
+    return "".join(parts)
+
+# TextNodeArray type code -> (open, close) for tag-pair types, else None.
+_CODE_TAG_PAIRS = tuple(_TAG_PAIRS.get(text_type) for text_type in CODE_TEXT_TYPES)
+_LINK_CODE = TEXT_TYPE_CODES[TextType.link]
+
+def _render_array(nodes):
+    parts = []
+    append = parts.append
+    source = nodes.source
+    url_table = nodes.url_table
+    plain_code = TEXT_TYPE_CODES[TextType.plaintext]
+    for code, start, end, url_id in zip(nodes.types, nodes.starts, nodes.ends, nodes.url_ids):
+        if code == plain_code:
+            append(source[start:end])
+            continue
+        pair = _CODE_TAG_PAIRS[code]
+        if pair is not None:
+            append(pair[0])
+            append(source[start:end])
+            append(pair[1])
+        elif code == _LINK_CODE:
+            append(_link_html(source[start:end], url_table[url_id]))
         else:
-            raise Exception(f"Unsupported TextType: {text_node.text_type}")
+            append(_image_html(source[start:end], url_table[url_id]))
+    return "".join(parts)
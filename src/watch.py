@@ -0,0 +1,178 @@
+"""Rebuild pages while they are being edited.
+
+`Watcher` brings `output_dir` up to date with a normal `build`, then polls
+the modification time and size of every source. A changed page is split
+into blocks again, but only blocks whose type and lines differ from the
+page's previous version are converted; the HTML of every other block is
+reused from memory. Polling uses only `os.scandir` and `os.stat`, so it
+works on any platform and filesystem.
+
+A full scan stats every source, which takes a while on a large site, so
+`run` checks the pages edited during the session on every tick and scans
+everything only every few ticks.
+
+    watcher = Watcher("content", "public")
+    watcher.start()
+    watcher.run(interval=0.25)
+
+Pages are independent of each other, so a change never rebuilds another
+page. The manifest is left to the next `build`, which notices the edited
+sources by their new modification times.
+"""
+from block_markdown import block_to_html_node, iter_blocks
+from build import build, output_path_for
+import os
+import time
+
+
+def scan_sources(content_dir):
+    """Return `{source: (mtime_ns, size)}` for every `.md` file under
+    `content_dir`, keyed by path relative to it.
+
+    Files and subdirectories removed while the scan runs (editors saving
+    through temporary files do this all the time) are left out. A missing
+    `content_dir` itself raises, rather than reporting every page gone.
+    """
+    found = {}
+    stack = [(content_dir, "")]
+    while stack:
+        directory, prefix = stack.pop()
+        try:
+            entries = os.scandir(directory)
+        except (FileNotFoundError, NotADirectoryError):
+            if not prefix:
+                raise
+            continue
+        with entries:
+            for entry in entries:
+                name = entry.name
+                if name.endswith(".md") and entry.is_file():
+                    try:
+                        st = entry.stat()
+                    except FileNotFoundError:
+                        continue
+                    found[prefix + name] = (st.st_mtime_ns, st.st_size)
+                elif entry.is_dir(follow_symlinks=False):
+                    # Like os.walk in build.find_sources, symlinked
+                    # directories are not followed.
+                    stack.append((entry.path, prefix + name + os.sep))
+    return found
+
+
+class Watcher:
+    def __init__(self, content_dir, output_dir, cache=None):
+        self.content_dir = content_dir
+        self.output_dir = output_dir
+        self.cache = cache
+        self.sources = {}
+        # Sources whose last conversion failed; retried on every poll.
+        self.failed = set()
+        # source -> {(BlockType, lines): html} for the page's last version
+        self.pages = {}
+
+    def start(self, force=False):
+        """Run a full incremental build and take the first snapshot."""
+        report = build(self.content_dir, self.output_dir, force=force, cache=self.cache)
+        self.sources = scan_sources(self.content_dir)
+        self.pages.clear()
+        self.failed.clear()
+        return report
+
+    def poll(self, sources=None):
+        """Rebuild the sources that changed since the last snapshot.
+
+        With `sources`, only those sources are checked, which is much
+        cheaper than a full scan on a large site; new files are picked up
+        by the next full poll.
+
+        Returns a report dict with the `built` and `removed` sources, the
+        `errors` of pages that failed to convert (their old output is
+        kept), and how many blocks were `rendered` and `reused`.
+        """
+        if sources is None:
+            current = scan_sources(self.content_dir)
+            checked = current
+        else:
+            current = dict(self.sources)
+            checked = []
+            for source in sources:
+                try:
+                    st = os.stat(os.path.join(self.content_dir, source))
+                except FileNotFoundError:
+                    current.pop(source, None)
+                    continue
+                current[source] = (st.st_mtime_ns, st.st_size)
+                checked.append(source)
+        report = {"built": [], "removed": [], "errors": {}, "rendered": 0, "reused": 0}
+
+        for source in sorted(checked):
+            if source not in self.failed and self.sources.get(source) == current[source]:
+                continue
+            try:
+                self._rebuild_page(source, report)
+            except Exception as exc:
+                report["errors"][source] = str(exc)
+                self.failed.add(source)
+                continue
+            self.failed.discard(source)
+            report["built"].append(source)
+
+        for source in sorted(self.sources.keys() - current.keys()):
+            self.failed.discard(source)
+            self.pages.pop(source, None)
+            try:
+                os.remove(output_path_for(self.output_dir, source))
+            except FileNotFoundError:
+                pass
+            report["removed"].append(source)
+
+        self.sources = current
+        return report
+
+    def _rebuild_page(self, source, report):
+        with open(os.path.join(self.content_dir, source), encoding="utf-8") as f:
+            blocks = [(block_type, tuple(lines)) for block_type, lines in iter_blocks(f)]
+
+        previous = self.pages.get(source, {})
+        rendered = {}
+        chunks = ["<div>"]
+        for key in blocks:
+            html = rendered.get(key)
+            if html is None:
+                html = previous.get(key)
+                if html is None:
+                    html = block_to_html_node(key[0], list(key[1]), self.cache).to_html()
+                    report["rendered"] += 1
+                else:
+                    report["reused"] += 1
+                rendered[key] = html
+            else:
+                report["reused"] += 1
+            chunks.append(html)
+        chunks.append("</div>")
+
+        target = output_path_for(self.output_dir, source)
+        os.makedirs(os.path.dirname(target), exist_ok=True)
+        # Binary, like convert_markdown_file, so "\n" is never translated.
+        with open(target, "wb") as f:
+            f.write("".join(chunks).encode())
+        self.pages[source] = rendered
+
+    def run(self, interval=0.5, on_rebuild=None, full_every=4):
+        """Poll until interrupted, passing each report that changed
+        something to `on_rebuild`.
+
+        Pages edited during this session (and pages that failed) are
+        checked every `interval` seconds; the whole content directory is
+        scanned every `full_every` intervals.
+        """
+        ticks = 0
+        while True:
+            time.sleep(interval)
+            ticks += 1
+            if ticks % full_every == 0:
+                report = self.poll()
+            else:
+                report = self.poll(self.pages.keys() | self.failed)
+            if on_rebuild is not None and (report["built"] or report["removed"] or report["errors"]):
+                on_rebuild(report)